@@ -52,17 +52,14 @@
     
 # 
 
-import sqlite3
 import pandas as pd
-
-DB_NAME = "mtech_offers.db"
+from database import db_manager
 
 def check_seat_matrix():
     try:
-        conn = sqlite3.connect(DB_NAME)
+        conn = db_manager.get_connection()
         query = "SELECT * FROM seat_matrix"
         df = pd.read_sql_query(query, conn)
-        conn.close()
 
         if df.empty:
             print("⚠️ No records found in seat_matrix table.")
@@ -0,0 +1,118 @@
+# database/candidate_edits.py
+"""
+Corrections to candidate data made in the Update dialog.
+
+A plain import of an applicant workbook never changes a candidate that is
+already in the table (INSERT OR IGNORE on App_no), so single fixes to
+category, PWD / EWS flags or scores are made here; a corrected export is
+re-imported with a delta import (database/ingest.py).  The dialog stages
+the changed fields and apply_edits() writes them:
+
+  * in one transaction for any number of candidates, so either every staged
+    edit lands or none does;
+  * with an optimistic-concurrency check: every candidate row carries a
+    row_version that each edit increments, and an edit made against an
+    older version (someone else saved in between) raises EditConflict;
+  * keeping the derived data in step for the edited candidates only --
+    seat codes (seat_codes.refresh), facet counts, the full-text index (its
+    update trigger) and the record cache.  candidate_status depends only on
+    offers and decisions, which edits don't touch.
+"""
+from database import db_manager, facets, record_cache, seat_codes
+from database.db_manager import DB_NAME
+
+VERSION_COLUMN = "row_version"
+
+EDITS_DDL = [
+    f"ALTER TABLE candidates ADD COLUMN {VERSION_COLUMN} INTEGER NOT NULL DEFAULT 0",
+]
+
+# Editable columns: a fixed set of values ...
+CHOICE_COLUMNS = {
+    "Category": ["GEN", "OBC", "SC", "ST"],
+    "Gender": ["Male", "Female"],
+    "Ews": ["Yes", "No"],
+    "Pwd": ["Yes", "No"],
+}
+# ... free text, or a number (blank = NULL for both)
+TEXT_COLUMNS = ["Full_Name", "Email"]
+NUMBER_COLUMNS = ["MaxGATEScore_3yrs", "SSC_per", "HSSC_per", "Degree_CGPA_8th"]
+
+EDITABLE_COLUMNS = TEXT_COLUMNS + list(CHOICE_COLUMNS) + NUMBER_COLUMNS
+
+# Changes to these re-code the candidate's seat (database/seat_codes.py)
+SEAT_COLUMNS = {"Category", "Gender", "Ews", "Pwd"}
+
+
+class EditConflict(Exception):
+    """A staged edit was made against a candidate row that has changed since."""
+
+
+def clean_value(column, value):
+    """Validate / convert one staged value for column; raises ValueError."""
+    if column not in EDITABLE_COLUMNS:
+        raise ValueError(f"{column} cannot be edited")
+    if isinstance(value, str):
+        value = value.strip()
+    if value in (None, ""):
+        if column in CHOICE_COLUMNS:
+            raise ValueError(f"{column} must be one of {', '.join(CHOICE_COLUMNS[column])}")
+        return None
+    if column in CHOICE_COLUMNS:
+        if value not in CHOICE_COLUMNS[column]:
+            raise ValueError(f"{column} must be one of {', '.join(CHOICE_COLUMNS[column])}")
+        return value
+    if column in NUMBER_COLUMNS:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{column} must be a number, not {value!r}") from None
+    return str(value)
+
+
+def apply_edits(edits, db_name=DB_NAME, progress=None):
+    """
+    Write staged edits: {App_no: (row_version the edits were made against,
+    {column: new value})}.  Returns the number of candidates updated.
+    Raises ValueError for a bad value and EditConflict if any candidate has
+    a newer row_version (nothing is written then).  The Update dialog runs
+    it as a background job; `progress(message)` is called before writing.
+    """
+    edits = {app_no: (version, {col: clean_value(col, v) for col, v in changes.items()})
+             for app_no, (version, changes) in edits.items() if changes}
+    if not edits:
+        return 0
+    if progress:
+        progress(f"Saving changes to {len(edits)} candidate(s)...")
+
+    with db_manager.transaction(db_name) as conn:
+        app_table = db_manager.load_temp_keys(conn, "edited_app_nos", edits)
+        coap_of = dict(conn.execute(f"""
+            SELECT c.App_no, c.COAP FROM candidates c JOIN {app_table} t ON t.key = c.App_no
+        """))
+        coaps = [coap for coap in coap_of.values() if coap is not None]
+        table = db_manager.load_temp_keys(conn, "edited_coaps", coaps)
+        # Facet counts: take the candidates out, update them, count them back in
+        facets.remove_coaps(conn, table)
+
+        recode = []
+        for app_no, (version, changes) in edits.items():
+            assignments = ", ".join(f'"{col}" = ?' for col in changes)
+            cursor = conn.execute(f"""
+                UPDATE candidates
+                SET {assignments}, {VERSION_COLUMN} = {VERSION_COLUMN} + 1
+                WHERE App_no = ? AND {VERSION_COLUMN} = ?
+            """, [*changes.values(), app_no, version])
+            if cursor.rowcount != 1:
+                # Rolls the whole batch back
+                raise EditConflict(
+                    f"Candidate {app_no} was changed by someone else since it was opened. "
+                    "Reload it and make the edits again.")
+            if SEAT_COLUMNS & changes.keys():
+                recode.append(app_no)
+
+        if recode:
+            seat_codes.refresh(conn, [coap_of[app_no] for app_no in recode])
+        facets.add_coaps(conn, table)
+        record_cache.invalidate(coaps)
+    return len(edits)
@@ -0,0 +1,105 @@
+# database/candidate_history.py
+"""
+One candidate's offers and decisions, for the Update dialog.
+
+candidate_history is a view of candidates joined to candidate_status (the
+materialised summary of offers and decision reports), adding:
+
+    Offered               'Yes' once the candidate has had an offer
+    Accepted              'Yes' (accepted and frozen), 'No' (rejected) or
+                          'Retained' (retained and waiting); NULL before any decision
+    OfferCat              seat of the latest offer, e.g. OBC_Female
+    isOfferPwd            'Yes' if that seat is a PWD seat
+    OfferedRound          round of the latest offer
+    RetainRound           latest round the IIT Goa seat was retained
+    RejectOrAcceptRound   round the candidate left the process (froze or rejected)
+
+record() reads a candidate's row from it with one indexed lookup on
+each table (records() several at once); timeline() lists the round-by-round
+offers and decisions.  database/record_cache.py caches both per COAP.
+"""
+from database import decisions
+
+HISTORY_DDL = [
+    "DROP VIEW IF EXISTS candidate_history",
+    """
+    CREATE VIEW candidate_history AS
+    SELECT c.*,
+           CASE WHEN s.last_offer_round IS NULL THEN 'No' ELSE 'Yes' END AS Offered,
+           CASE s.state WHEN 'frozen' THEN 'Yes' WHEN 'rejected' THEN 'No'
+                        WHEN 'retained' THEN 'Retained' END AS Accepted,
+           s.last_offer_category AS OfferCat,
+           CASE WHEN s.last_offer_category IS NULL THEN NULL
+                WHEN s.last_offer_category LIKE '%\\_PWD' ESCAPE '\\' THEN 'Yes' ELSE 'No' END AS isOfferPwd,
+           s.last_offer_round AS OfferedRound,
+           s.retained_round AS RetainRound,
+           s.out_round AS RejectOrAcceptRound
+    FROM candidates c
+    LEFT JOIN candidate_status s ON s.COAP = c.COAP
+    """,
+]
+
+# Columns of candidate_history, read once per process (the schema only
+# changes through migrations, which run before the first query)
+_columns = None
+
+
+def columns(conn):
+    global _columns
+    if _columns is None:
+        _columns = [info[1] for info in conn.execute("PRAGMA table_info(candidate_history)")]
+    return _columns
+
+
+def record(conn, coap):
+    """{column: value} of candidate_history for this COAP, or {} if unknown."""
+    cols = columns(conn)
+    row = conn.execute(
+        f"SELECT {', '.join(f'h.{col}' for col in cols)} FROM candidate_history h WHERE h.COAP = ? LIMIT 1",
+        (coap,),
+    ).fetchone()
+    return dict(zip(cols, row)) if row else {}
+
+
+def records(conn, coaps):
+    """{COAP: record} for the given COAPs that exist (one query)."""
+    coaps = list(coaps)
+    if not coaps:
+        return {}
+    cols = columns(conn)
+    coap_index = cols.index("COAP")
+    result = {}
+    for row in conn.execute(
+        f"SELECT {', '.join(f'h.{col}' for col in cols)} FROM candidate_history h "
+        f"WHERE h.COAP IN ({', '.join('?' * len(coaps))})",
+        coaps,
+    ):
+        # Same row as record() when a COAP is listed twice: the first one
+        result.setdefault(row[coap_index], dict(zip(cols, row)))
+    return result
+
+
+TIMELINE_COLUMNS = ["Round", "Offered Seat", "IIT Goa Decision", "Other Institute", "Consolidated Decision"]
+
+
+def timeline(conn, coap, app_no):
+    """[(round_no, offered category, IIT Goa, other institute, consolidated decision), ...] by round."""
+    return conn.execute("""
+        SELECT r.round_no,
+               (SELECT o.category FROM offers o WHERE o.round_no = r.round_no AND o.COAP = :coap),
+               (SELECT d.decision FROM decisions d
+                 WHERE d.source = :goa AND d.key = :app_no AND d.round_no = r.round_no),
+               (SELECT d.decision FROM decisions d
+                 WHERE d.source = :other AND d.key = :app_no AND d.round_no = r.round_no),
+               (SELECT d.decision FROM decisions d
+                 WHERE d.source = :consolidated AND d.key = :coap AND d.round_no = r.round_no)
+        FROM (
+            SELECT round_no FROM offers WHERE COAP = :coap
+            UNION SELECT round_no FROM decisions WHERE source IN (:goa, :other) AND key = :app_no
+            UNION SELECT round_no FROM decisions WHERE source = :consolidated AND key = :coap
+        ) r
+        ORDER BY r.round_no
+    """, {
+        "coap": coap, "app_no": app_no,
+        "goa": decisions.IIT_GOA, "other": decisions.OTHER_INSTITUTE, "consolidated": decisions.CONSOLIDATED,
+    }).fetchall()
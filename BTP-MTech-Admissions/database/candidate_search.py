@@ -0,0 +1,181 @@
+# database/candidate_search.py
+"""
+Full-text candidate search.
+
+candidates_fts is an FTS5 index over the name, email, COAP, App_no and GATE
+roll number columns of candidates (external content: the text stays in
+candidates, the index only maps tokens to rowids).  Triggers keep it in
+sync on INSERT / DELETE and on UPDATEs of the indexed columns only, so the
+seat-code updates that follow an ingest don't touch it.  Bulk ingest
+suspends the triggers and rebuilds the index once instead (see
+suspend_sync()).
+
+search() matches every typed word as a prefix ("sha 2201" finds Sharma with
+COAP2201...), ranks by bm25 with identifiers weighted above names (then by
+GATE score), and can be narrowed by any condition on candidates (the
+search page's facet filters).  Every match is ranked: on 100k candidates
+identifier lookups take ~0.2 ms, name prefixes 3-20 ms, and a two-letter
+prefix that matches every candidate ~150 ms (the search box debounces
+typing).  If this SQLite build lacks FTS5
+the index is not created and search() falls back to prefix LIKE matching on
+COAP, App_no and name.
+"""
+import re
+
+INDEXED_COLUMNS = [
+    "Full_Name", "Email", "COAP", "App_no",
+    "GATE_Roll_num", "GATE22RollNo", "GATE21RollNo", "GATE20RollNo",
+]
+
+# bm25 weights, same order as INDEXED_COLUMNS: an identifier hit ranks above a name hit
+COLUMN_WEIGHTS = [2.0, 1.0, 10.0, 10.0, 5.0, 5.0, 5.0, 5.0]
+
+RESULT_LIMIT = 50
+
+# Queries shorter than this (letters / digits) return nothing: "a" matches most names
+MIN_QUERY_CHARS = 2
+
+_cols = ", ".join(INDEXED_COLUMNS)
+_new = ", ".join(f"new.{c}" for c in INDEXED_COLUMNS)
+_old = ", ".join(f"old.{c}" for c in INDEXED_COLUMNS)
+
+INDEX_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+        {_cols},
+        content='candidates', content_rowid='rowid',
+        prefix='2 4'
+    )
+    """,
+    # Persistent default for ORDER BY rank
+    f"""
+    INSERT INTO candidates_fts (candidates_fts, rank)
+    VALUES ('rank', 'bm25({", ".join(str(w) for w in COLUMN_WEIGHTS)})')
+    """,
+]
+
+SYNC_TRIGGERS = ["candidates_fts_insert", "candidates_fts_delete", "candidates_fts_update"]
+
+SYNC_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS candidates_fts_insert AFTER INSERT ON candidates BEGIN
+        INSERT INTO candidates_fts (rowid, {_cols}) VALUES (new.rowid, {_new});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS candidates_fts_delete AFTER DELETE ON candidates BEGIN
+        INSERT INTO candidates_fts (candidates_fts, rowid, {_cols}) VALUES ('delete', old.rowid, {_old});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS candidates_fts_update AFTER UPDATE OF {_cols} ON candidates BEGIN
+        INSERT INTO candidates_fts (candidates_fts, rowid, {_cols}) VALUES ('delete', old.rowid, {_old});
+        INSERT INTO candidates_fts (rowid, {_cols}) VALUES (new.rowid, {_new});
+    END
+    """,
+]
+
+# Columns returned for each hit (the search page's result table)
+RESULT_COLUMNS = """
+    c.COAP AS coap_id, c.Full_Name AS full_name, c.App_no AS application_number,
+    c.Category AS category, c.Gender AS gender, c.MaxGATEScore_3yrs AS max_gate_score,
+    c.Pwd AS pwd, c.Ews AS ews
+"""
+
+
+def fts_supported(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+    except Exception:
+        return False
+    conn.execute("DROP TABLE temp.fts5_probe")
+    return True
+
+
+def create_index(conn):
+    """Create and fill candidates_fts (a no-op without FTS5 support)."""
+    if not fts_supported(conn):
+        return False
+    for statement in INDEX_DDL + SYNC_DDL:
+        conn.execute(statement)
+    rebuild(conn)
+    return True
+
+
+def has_index(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'candidates_fts'"
+    ).fetchone() is not None
+
+
+def rebuild(conn):
+    """Re-index every candidate from the candidates table."""
+    conn.execute("INSERT INTO candidates_fts (candidates_fts) VALUES ('rebuild')")
+
+
+def suspend_sync(conn):
+    """
+    Drop the sync triggers for a bulk load; resume_sync() re-indexes afterwards.
+    (Per-row triggers cost ~50 us a row, a rebuild ~10 us.)  Call both inside
+    the same transaction so a rollback restores the triggers too.
+    """
+    if not has_index(conn):
+        return False
+    for trigger in SYNC_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    return True
+
+
+def resume_sync(conn):
+    """Recreate the sync triggers dropped by suspend_sync() and rebuild the index."""
+    for statement in SYNC_DDL:
+        conn.execute(statement)
+    rebuild(conn)
+
+
+def _terms(text):
+    """Words of the query; FTS5 tokenises on anything that isn't a letter or digit."""
+    return re.findall(r"\w+", text or "")
+
+
+def match_expression(text):
+    """FTS5 MATCH string requiring every word as a prefix, or None for an empty query."""
+    terms = _terms(text)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search(conn, text, where="", params=(), limit=RESULT_LIMIT):
+    """
+    Best-ranked candidates matching text (see module docstring), as sqlite3
+    rows / tuples; `where` (SQL on candidates c, e.g. facets.candidate_where())
+    narrows them further.
+    """
+    extra = f" AND ({where})" if where else ""
+    params = list(params)
+    terms = _terms(text)
+    if len("".join(terms)) < MIN_QUERY_CHARS:
+        return []
+
+    if has_index(conn):
+        # Every match is ranked, so the best ones win however many there are
+        return conn.execute(f"""
+            SELECT {RESULT_COLUMNS}
+            FROM candidates_fts f
+            JOIN candidates c ON c.rowid = f.rowid
+            WHERE candidates_fts MATCH ?{extra}
+            ORDER BY f.rank, c.MaxGATEScore_3yrs DESC
+            LIMIT ?
+        """, [match_expression(text), *params, limit]).fetchall()
+
+    # No FTS5: every word must prefix-match COAP, App_no or the name
+    matches = " AND ".join("(c.COAP LIKE ? OR c.App_no LIKE ? OR c.Full_Name LIKE ?)" for _ in terms)
+    like = [p for term in terms for p in (f"{term}%",) * 3]
+    return conn.execute(f"""
+        SELECT {RESULT_COLUMNS}
+        FROM candidates c
+        WHERE {matches}{extra}
+        ORDER BY c.MaxGATEScore_3yrs DESC
+        LIMIT ?
+    """, [*like, *params, limit]).fetchall()
@@ -0,0 +1,158 @@
+# database/candidate_status.py
+"""
+Materialised per-candidate round status, one row per COAP that has an
+offer or a decision:
+
+    state              'frozen' | 'rejected' | 'retained' | 'offered'
+    out_round          first round after which the candidate takes no more offers
+    frozen_round       first 'Accept and Freeze' (IIT Goa or consolidated report)
+    rejected_round     first 'Reject and Wait' at IIT Goa
+    retained_round     latest 'Retain and Wait' at IIT Goa, with the category
+                       offered in that round as retained_category
+    last_offer_round / last_offer_category
+
+Rows are recomputed only for the candidates touched by a decision upload,
+reset or round run (refresh()), so deciding who is still eligible is one
+indexed read no matter how many rounds have run.  rebuild() recomputes the
+whole table from decisions and offers.
+"""
+from database import db_manager, decisions, facets, record_cache
+
+STATUS_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS candidate_status (
+        COAP TEXT PRIMARY KEY,
+        state TEXT NOT NULL,
+        out_round INTEGER,
+        frozen_round INTEGER,
+        rejected_round INTEGER,
+        retained_round INTEGER,
+        retained_category TEXT,
+        last_offer_round INTEGER,
+        last_offer_category TEXT
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_candidate_status_out ON candidate_status(out_round)",
+    "CREATE INDEX IF NOT EXISTS idx_candidate_status_retained ON candidate_status(retained_round)",
+]
+
+# Recompute the status of every COAP in temp.status_dirty (parameters: _REFRESH_PARAMS)
+_REFRESH_SQL = """
+    INSERT OR REPLACE INTO candidate_status (
+        COAP, state, out_round, frozen_round, rejected_round,
+        retained_round, retained_category, last_offer_round, last_offer_category
+    )
+    SELECT COAP,
+           CASE WHEN frozen_round IS NOT NULL AND frozen_round <= COALESCE(rejected_round, frozen_round) THEN 'frozen'
+                WHEN rejected_round IS NOT NULL THEN 'rejected'
+                WHEN retained_round IS NOT NULL THEN 'retained'
+                ELSE 'offered' END,
+           CASE WHEN rejected_round IS NULL THEN frozen_round
+                WHEN frozen_round IS NULL THEN rejected_round
+                ELSE MIN(frozen_round, rejected_round) END,
+           frozen_round, rejected_round, retained_round,
+           (SELECT o.category FROM offers o WHERE o.COAP = s.COAP AND o.round_no = s.retained_round),
+           last_offer_round,
+           (SELECT o.category FROM offers o WHERE o.COAP = s.COAP AND o.round_no = s.last_offer_round)
+    FROM (
+        SELECT COAP,
+               CASE WHEN goa_frozen IS NULL THEN consolidated_frozen
+                    WHEN consolidated_frozen IS NULL THEN goa_frozen
+                    ELSE MIN(goa_frozen, consolidated_frozen) END AS frozen_round,
+               rejected_round, retained_round, last_offer_round
+        FROM (
+            SELECT t.key AS COAP,
+                   (SELECT MIN(d.round_no) FROM decisions d
+                     WHERE d.source = :goa AND d.key = c.App_no
+                       AND d.decision = :freeze) AS goa_frozen,
+                   (SELECT MIN(d.round_no) FROM decisions d
+                     WHERE d.source = :consolidated AND d.key = t.key
+                       AND d.decision = :freeze) AS consolidated_frozen,
+                   (SELECT MIN(d.round_no) FROM decisions d
+                     WHERE d.source = :goa AND d.key = c.App_no
+                       AND d.decision = :reject) AS rejected_round,
+                   (SELECT MAX(d.round_no) FROM decisions d
+                     WHERE d.source = :goa AND d.key = c.App_no
+                       AND d.decision = :retain) AS retained_round,
+                   (SELECT MAX(o.round_no) FROM offers o WHERE o.COAP = t.key) AS last_offer_round
+            FROM temp.status_dirty t
+            LEFT JOIN candidates c ON c.COAP = t.key
+        )
+    ) s
+    WHERE frozen_round IS NOT NULL OR rejected_round IS NOT NULL
+       OR retained_round IS NOT NULL OR last_offer_round IS NOT NULL
+"""
+
+
+_REFRESH_PARAMS = {
+    "goa": decisions.IIT_GOA,
+    "consolidated": decisions.CONSOLIDATED,
+    "freeze": decisions.ACCEPT_AND_FREEZE,
+    "reject": decisions.REJECT_AND_WAIT,
+    "retain": decisions.RETAIN_AND_WAIT,
+}
+
+
+def _apply_dirty(conn):
+    # The facet counts include each candidate's state: move the dirty ones
+    facets.remove_coaps(conn, "temp.status_dirty")
+    conn.execute("DELETE FROM candidate_status WHERE COAP IN (SELECT key FROM temp.status_dirty)")
+    conn.execute(_REFRESH_SQL, _REFRESH_PARAMS)
+    facets.add_coaps(conn, "temp.status_dirty")
+    record_cache.invalidate(key for (key,) in conn.execute("SELECT key FROM temp.status_dirty"))
+
+
+def refresh(conn, app_nos=(), coaps=()):
+    """
+    Recompute the status of the given candidates (by application number
+    and/or COAP). Runs inside the caller's transaction.
+    """
+    app_table = db_manager.load_temp_keys(conn, "status_app_nos", app_nos)
+    dirty = db_manager.load_temp_keys(conn, "status_dirty", coaps)
+    conn.execute(f"""
+        INSERT OR IGNORE INTO {dirty} (key)
+        SELECT c.COAP FROM {app_table} a JOIN candidates c ON c.App_no = a.key
+        WHERE c.COAP IS NOT NULL
+    """)
+    _apply_dirty(conn)
+
+
+def rebuild(conn):
+    """Recompute candidate_status for everyone from decisions and offers."""
+    dirty = db_manager.load_temp_keys(conn, "status_dirty", ())
+    conn.execute("DELETE FROM candidate_status")
+    conn.execute(f"""
+        INSERT OR IGNORE INTO {dirty} (key)
+        SELECT COAP FROM offers WHERE COAP IS NOT NULL
+        UNION SELECT c.COAP FROM decisions d JOIN candidates c ON c.App_no = d.key
+              WHERE d.source = :goa AND c.COAP IS NOT NULL
+        UNION SELECT key FROM decisions WHERE source = :consolidated
+    """, _REFRESH_PARAMS)
+    conn.execute(_REFRESH_SQL, _REFRESH_PARAMS)
+    if facets.has_table(conn):
+        facets.rebuild(conn)
+    record_cache.clear()
+
+
+def eligible_coaps(conn, after_round):
+    """COAPs with a GATE score that are still in the running after after_round's decisions."""
+    rows = conn.execute("""
+        SELECT c.COAP
+        FROM candidates c
+        WHERE c.MaxGATEScore_3yrs IS NOT NULL
+          AND c.COAP NOT IN (SELECT COAP FROM candidate_status WHERE out_round <= ?)
+    """, (after_round,)).fetchall()
+    return [coap for (coap,) in rows]
+
+
+def retained_candidates(conn, round_no):
+    """{COAP: category offered in round_no} for candidates who chose 'Retain and Wait' in round_no."""
+    rows = conn.execute("""
+        SELECT c.COAP, o.category
+        FROM decisions d
+        JOIN candidates c ON c.App_no = d.key
+        JOIN offers o ON o.COAP = c.COAP AND o.round_no = d.round_no
+        WHERE d.source = :goa AND d.decision = :retain AND d.round_no = :round_no
+          AND o.category IS NOT NULL
+    """, {**_REFRESH_PARAMS, "round_no": round_no}).fetchall()
+    return dict(rows)
@@ -1,23 +1,189 @@
+"""
+Central SQLite connection manager.
+
+Every module gets its connections from here instead of calling
+sqlite3.connect() itself.  Connections are opened once per (thread, database
+file) and reused, and each one is configured with CONNECTION_PRAGMAS (WAL
+journaling, relaxed fsync, bigger page cache, memory-mapped I/O).
+
+Pooled connections must not be closed by callers; use transaction() for
+writes:
+
+    with db_manager.transaction() as conn:
+        conn.execute("UPDATE ...")
+
+Background threads call close_thread_connections() when they finish.
+
+The first connection to a database file in this process also applies any
+pending schema migrations (see database/migrations.py).
+"""
+import os
 import sqlite3
+import threading
+from contextlib import contextmanager
+
 DB_NAME = "mtech_offers.db"
 
-def get_connection():
-    return sqlite3.connect(DB_NAME)
+# Wait this long for another connection's write lock before failing with "database is locked"
+BUSY_TIMEOUT_SECONDS = 15
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",        # readers don't block the writer (GUI stays responsive during jobs)
+    "PRAGMA synchronous = NORMAL",      # safe with WAL, avoids an fsync per commit
+    "PRAGMA cache_size = -32000",       # 32 MB page cache
+    "PRAGMA mmap_size = 268435456",     # 256 MB memory-mapped reads
+    "PRAGMA temp_store = MEMORY",
+)
+
+_local = threading.local()
+
+# Database files already migrated by this process
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+def _pool():
+    if not hasattr(_local, "connections"):
+        _local.connections = {}
+        _local.depths = {}
+    return _local.connections
+
+
+def _key(db_path):
+    return os.path.abspath(str(db_path))
+
+
+def _is_open(conn):
+    try:
+        conn.in_transaction
+        return True
+    except sqlite3.ProgrammingError:
+        return False
+
+
+def get_connection(db_path=DB_NAME):
+    """Return this thread's shared connection to db_path, opening it on first use."""
+    pool = _pool()
+    key = _key(db_path)
+    conn = pool.get(key)
+    if conn is None or not _is_open(conn):
+        if conn is not None:
+            _forget(conn)
+        conn = sqlite3.connect(key, timeout=BUSY_TIMEOUT_SECONDS)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        _ensure_migrated(key, conn)
+        pool[key] = conn
+    return conn
+
+
+def _ensure_migrated(key, conn):
+    if key in _migrated:
+        return
+    with _migrate_lock:
+        if key not in _migrated:
+            from database import migrations
+            migrations.upgrade(conn)
+            _migrated.add(key)
+
+
+@contextmanager
+def transaction(db_path=DB_NAME):
+    """
+    Commit everything done inside the block at once, or roll it all back on error.
+
+    Nested transaction() blocks on the same thread join the outermost one.
+    """
+    conn = get_connection(db_path)
+    key = _key(db_path)
+    depth = _local.depths.get(key, 0)
+    _local.depths[key] = depth + 1
+    try:
+        if depth == 0 and not conn.in_transaction:
+            # Take the write lock up front instead of failing halfway through
+            conn.execute("BEGIN IMMEDIATE")
+        yield conn
+        if depth == 0:
+            conn.commit()
+    except BaseException:
+        if depth == 0:
+            conn.rollback()
+        raise
+    finally:
+        _local.depths[key] = depth
+
+
+@contextmanager
+def bulk_load(db_path=DB_NAME):
+    """transaction() with fsync switched off for the duration of a large import."""
+    conn = get_connection(db_path)
+    conn.execute("PRAGMA synchronous = OFF")
+    try:
+        with transaction(db_path) as conn:
+            yield conn
+    finally:
+        conn.execute("PRAGMA synchronous = NORMAL")
+
+
+def load_temp_keys(conn, name, values):
+    """
+    Replace the contents of the TEMP table `name` (one indexed TEXT column,
+    `key`) with `values` and return its qualified name.
+
+    Use it to join against a list of ids with bound parameters instead of
+    formatting them into an IN (...) string:
+
+        table = db_manager.load_temp_keys(conn, "eligible", coaps)
+        conn.execute(f"SELECT ... FROM candidates c JOIN {table} t ON t.key = c.COAP")
+    """
+    if not name.isidentifier():
+        raise ValueError(f"Invalid temp table name: {name!r}")
+    conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {name} (key TEXT PRIMARY KEY) WITHOUT ROWID")
+    conn.execute(f"DELETE FROM temp.{name}")
+    conn.executemany(f"INSERT OR IGNORE INTO temp.{name} (key) VALUES (?)",
+                     ((v,) for v in values if v is not None))
+    return f"temp.{name}"
+
+
+def _forget(conn):
+    # record_cache remembers each pooled connection's data_version
+    from database import record_cache
+    record_cache.forget(conn)
+
+
+def close_connection(db_path=DB_NAME):
+    """Close this thread's connection to db_path (e.g. before deleting the file)."""
+    conn = _pool().pop(_key(db_path), None)
+    if conn is not None:
+        _forget(conn)
+        conn.close()
+
+
+def close_thread_connections():
+    """Close every connection opened by the calling thread."""
+    pool = _pool()
+    for conn in pool.values():
+        _forget(conn)
+        conn.close()
+    pool.clear()
+
 
 def fetch_all_candidates():
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM candidates")
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+    return cursor.fetchall()
 
 def insert_candidate(data_dict):
-    conn = get_connection()
-    cursor = conn.cursor()
-    columns = ', '.join(data_dict.keys())
-    placeholders = ', '.join(['?'] * len(data_dict))
-    cursor.execute(f'INSERT OR IGNORE INTO candidates ({columns}) VALUES ({placeholders})',
-                   tuple(data_dict.values()))
-    conn.commit()
-    conn.close()
+    from database import facets, ingest, record_cache, seat_codes
+    # The normalised seat columns and the delta-import hash go in with the row
+    columns = [*data_dict, *seat_codes.CODED_COLUMNS, ingest.HASH_COLUMN]
+    values = tuple(data_dict.values())
+    row, = seat_codes.coded_rows(list(data_dict), [values])
+    row = (*row, ingest.row_hash(list(data_dict), values))
+    placeholders = ', '.join(['?'] * len(columns))
+    with transaction() as conn:
+        last_rowid = facets.max_rowid(conn)
+        conn.execute(f'INSERT OR IGNORE INTO candidates ({", ".join(columns)}) VALUES ({placeholders})', row)
+        facets.add_candidates(conn, last_rowid)
+        record_cache.clear()
@@ -0,0 +1,156 @@
+# database/decisions.py
+"""
+Round decision reports, stored in one table:
+
+    decisions(round_no, source, key, decision)
+
+source is one of DECISION_SOURCES; key is the MTech application number for
+the IIT Goa / other-institute reports and the COAP id for the consolidated
+report.  The old per-round tables (iit_goa_offers_round{N}, ...) are kept
+as read-only views over this table so existing ad-hoc queries still work.
+"""
+import re
+
+IIT_GOA = "iit_goa"
+OTHER_INSTITUTE = "other_institute"
+CONSOLIDATED = "consolidated"
+
+# source -> (legacy table prefix, legacy key column, legacy decision column)
+DECISION_SOURCES = {
+    IIT_GOA: ("iit_goa_offers_round", "mtech_app_no", "applicant_decision"),
+    OTHER_INSTITUTE: ("accepted_other_institute_round", "mtech_app_no", "other_institute_decision"),
+    CONSOLIDATED: ("consolidated_decisions_round", "coap_reg_id", "applicant_decision"),
+}
+
+ACCEPT_AND_FREEZE = "Accept and Freeze"
+RETAIN_AND_WAIT = "Retain and Wait"
+REJECT_AND_WAIT = "Reject and Wait"
+
+DECISIONS_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS decisions (
+        round_no INTEGER NOT NULL,
+        source TEXT NOT NULL,
+        key TEXT NOT NULL,
+        decision TEXT,
+        PRIMARY KEY (round_no, source, key)
+    ) WITHOUT ROWID
+    """,
+    # Per-candidate lookups across rounds (eligibility, history)
+    "CREATE INDEX IF NOT EXISTS idx_decisions_source_key ON decisions(source, key, round_no, decision)",
+    # "everyone who chose X up to round N" (confirmed seats, retained candidates)
+    "CREATE INDEX IF NOT EXISTS idx_decisions_source_decision ON decisions(source, decision, round_no, key)",
+]
+
+
+def legacy_name(source, round_no):
+    return f"{DECISION_SOURCES[source][0]}{int(round_no)}"
+
+
+def _as_key(value):
+    """Decision keys are stored as text; Excel may hand back numbers for numeric ids."""
+    if value is None:
+        return None
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return None
+        if value.is_integer():
+            value = int(value)
+    key = str(value).strip()
+    return key or None
+
+
+def _as_decision(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return str(value).strip()
+
+
+def create_compat_views(conn, round_no):
+    """(Re)create the legacy per-round views for round_no."""
+    for source, (_, key_col, decision_col) in DECISION_SOURCES.items():
+        name = legacy_name(source, round_no)
+        kind = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+        if kind and kind[0] == "view":
+            continue
+        if kind:
+            conn.execute(f'DROP TABLE "{name}"')
+        conn.execute(f"""
+            CREATE VIEW "{name}" AS
+            SELECT key AS {key_col}, decision AS {decision_col}
+            FROM decisions
+            WHERE round_no = {int(round_no)} AND source = '{source}'
+        """)
+
+
+def save_decisions(conn, round_no, source, rows):
+    """
+    Replace the `source` report for round_no with rows of (key, decision).
+    Returns the number of rows stored. Runs inside the caller's transaction.
+    """
+    touched = _keys(conn, round_no, source)
+    count = _replace_rows(conn, round_no, source, rows)
+    touched.update(_keys(conn, round_no, source))
+    create_compat_views(conn, round_no)
+    _refresh_derived(conn, round_no, source, touched)
+    return count
+
+
+def _keys(conn, round_no, source):
+    rows = conn.execute("SELECT key FROM decisions WHERE round_no = ? AND source = ?", (round_no, source))
+    return {key for (key,) in rows}
+
+
+def _refresh_derived(conn, round_no, source, keys):
+    """Bring candidate_status and the seat ledger up to date after a change to round_no's decisions."""
+    from database import candidate_status, seat_ledger
+    if source == IIT_GOA:
+        candidate_status.refresh(conn, app_nos=keys)
+        seat_ledger.refresh_round(conn, round_no)
+    elif source == CONSOLIDATED:
+        candidate_status.refresh(conn, coaps=keys)
+
+
+def _replace_rows(conn, round_no, source, rows):
+    if source not in DECISION_SOURCES:
+        raise ValueError(f"Unknown decision source: {source}")
+    conn.execute("DELETE FROM decisions WHERE round_no = ? AND source = ?", (round_no, source))
+    cleaned = [(round_no, source, _as_key(k), _as_decision(d)) for k, d in rows]
+    cleaned = [row for row in cleaned if row[2] is not None]
+    conn.executemany(
+        "INSERT OR REPLACE INTO decisions (round_no, source, key, decision) VALUES (?, ?, ?, ?)",
+        cleaned
+    )
+    return len(cleaned)
+
+
+def clear_round(conn, round_no, source=None):
+    """Delete the decisions of round_no (one source or all of them)."""
+    for src in ([source] if source else DECISION_SOURCES):
+        touched = _keys(conn, round_no, src)
+        conn.execute("DELETE FROM decisions WHERE round_no = ? AND source = ?", (round_no, src))
+        _refresh_derived(conn, round_no, src, touched)
+
+
+def migrate_legacy_tables(conn):
+    """Copy every old per-round decision table into decisions and replace it with a view."""
+    tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    rounds = set()
+    for source, (prefix, key_col, decision_col) in DECISION_SOURCES.items():
+        pattern = re.compile(rf"^{prefix}(\d+)$")
+        for name in tables:
+            match = pattern.match(name)
+            if not match:
+                continue
+            round_no = int(match.group(1))
+            cols = [r[1] for r in conn.execute(f'PRAGMA table_info("{name}")')]
+            if len(cols) < 2:
+                continue
+            key = key_col if key_col in cols else cols[0]
+            decision = decision_col if decision_col in cols else cols[1]
+            rows = conn.execute(f'SELECT "{key}", "{decision}" FROM "{name}"').fetchall()
+            _replace_rows(conn, round_no, source, rows)
+            rounds.add(round_no)
+    # Only swap tables for views once every table of the round has been copied
+    for round_no in rounds:
+        create_compat_views(conn, round_no)
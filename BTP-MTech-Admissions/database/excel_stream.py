@@ -0,0 +1,112 @@
+# database/excel_stream.py
+"""
+Read-only, streaming access to .xlsx workbooks.
+
+openpyxl's read-only mode parses the sheet XML lazily, so rows can be pulled
+one at a time without materialising the workbook (or a DataFrame) in memory.
+Legacy .xls files are not supported by openpyxl; callers fall back to pandas.
+openpyxl itself is imported when a workbook is first opened, not at startup.
+"""
+import datetime
+from itertools import islice
+
+STREAMABLE_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+def is_streamable(path):
+    return str(path).lower().endswith(STREAMABLE_EXTENSIONS)
+
+
+def iter_row_batches(rows, batch_size):
+    """Group any row iterable into lists of at most batch_size rows."""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+# Same markers pd.read_excel treats as missing by default
+NA_STRINGS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+
+
+def _cell_value(value):
+    """Convert a cell to what pd.read_excel + the ingest cleaning would have produced."""
+    if isinstance(value, str):
+        return None if value in NA_STRINGS else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    # Dates go to SQLite as ISO strings
+    if isinstance(value, datetime.datetime):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+class ExcelStream:
+    """
+    Iterate the first (or named) sheet of a workbook in read-only mode.
+
+        with ExcelStream(path) as stream:
+            header = stream.header
+            for batch in stream.batches(5000):
+                ...
+    """
+    def __init__(self, path, sheet_name=None):
+        from openpyxl import load_workbook
+        self.workbook = load_workbook(path, read_only=True, data_only=True)
+        self.sheet = self.workbook[sheet_name] if sheet_name else self.workbook.worksheets[0]
+        self._rows = self.sheet.iter_rows(values_only=True)
+        self.header = list(next(self._rows, ()))
+
+    @property
+    def total_rows(self):
+        """Data rows according to the sheet dimension (None if the file does not record it)."""
+        max_row = self.sheet.max_row
+        return max_row - 1 if max_row else None
+
+    def rows(self):
+        width = len(self.header)
+        for row in self._rows:
+            # Skip fully empty trailing rows that some exporters leave behind
+            if row is None or all(v is None for v in row):
+                continue
+            row = tuple(_cell_value(v) for v in row[:width])
+            if len(row) < width:
+                row += (None,) * (width - len(row))
+            yield row
+
+    def batches(self, batch_size):
+        return iter_row_batches(self.rows(), batch_size)
+
+    def close(self):
+        self.workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_header_preview(path, preview_rows=5):
+    """
+    Return (header, rows) with the header row and at most preview_rows data rows.
+
+    Only the start of the sheet is parsed, so this stays fast for huge files.
+    """
+    if is_streamable(path):
+        with ExcelStream(path) as stream:
+            # Name headerless columns the way pandas does so usecols= lines up later
+            header = [f"Unnamed: {i}" if h is None else str(h) for i, h in enumerate(stream.header)]
+            return header, list(islice(stream.rows(), preview_rows))
+
+    import pandas as pd
+    df = pd.read_excel(path, nrows=preview_rows)
+    df = df.astype(object).where(pd.notnull(df), None)
+    return [str(c) for c in df.columns], list(df.itertuples(index=False, name=None))
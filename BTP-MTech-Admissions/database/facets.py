@@ -0,0 +1,185 @@
+# database/facets.py
+"""
+Faceted filtering of candidates with live per-value counts.
+
+candidate_facets holds the number of candidates for every combination of
+category (cat_code), gender, PWD, degree branch, round state
+(candidate_status.state, 'none' before the first offer) and GATE score band
+of SCORE_BAND points -- a couple of thousand rows however many candidates
+there are.  Facet counts are GROUP BYs over that table instead of over
+candidates (all facets on 100k candidates: 1-7 ms instead of ~430 ms), and the
+total for the current filters comes from it too.
+
+The table is kept up to date incrementally: ingest adds the new rows
+(add_candidates()), and candidate_status.refresh() / rebuild() move the
+candidates whose state changed (remove_coaps() / add_coaps()).  rebuild()
+recomputes it from scratch.
+
+Filters are a dict {facet name: set of values} (a missing or empty set means
+any value) plus an optional (min, max) score range in multiples of
+SCORE_BAND; candidate_where() turns them into SQL on candidates c for the
+result list, facet_where() into SQL on the counts table.
+"""
+from database.seat_codes import CATEGORY_NAMES
+
+SCORE_BAND = 50
+SCORE_MAX = 1000
+
+# name -> (label, counts column, expression on candidates c / candidate_status s)
+FACETS = {
+    "category": ("Category", "cat_code", "COALESCE(c.cat_code, -1)"),
+    "gender": ("Gender", "is_female", "COALESCE(c.is_female, 0)"),
+    "pwd": ("PWD", "is_pwd", "COALESCE(c.is_pwd, 0)"),
+    "branch": ("Degree Branch", "branch", "COALESCE(c.Degree_Branch, '')"),
+    "state": ("Round Status", "state", "COALESCE(s.state, 'none')"),
+}
+_SCORE_EXPR = f"COALESCE(CAST(c.MaxGATEScore_3yrs / {SCORE_BAND} AS INTEGER), -1)"
+
+FACETS_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS candidate_facets (
+        cat_code INTEGER NOT NULL,
+        is_female INTEGER NOT NULL,
+        is_pwd INTEGER NOT NULL,
+        branch TEXT NOT NULL,
+        state TEXT NOT NULL,
+        score_band INTEGER NOT NULL,
+        n INTEGER NOT NULL,
+        PRIMARY KEY (cat_code, is_female, is_pwd, branch, state, score_band)
+    ) WITHOUT ROWID
+    """,
+]
+
+_COLUMNS = [column for _, column, _ in FACETS.values()] + ["score_band"]
+_EXPRS = [expr for _, _, expr in FACETS.values()] + [_SCORE_EXPR]
+
+# Display text of the coded values
+_LABELS = {
+    "category": {**CATEGORY_NAMES, -1: "Unknown"},
+    "gender": {0: "Male", 1: "Female"},
+    "pwd": {0: "No", 1: "Yes"},
+    "state": {"none": "Not offered", "offered": "Offered", "retained": "Retained",
+              "frozen": "Accepted & frozen", "rejected": "Rejected"},
+}
+
+
+def label(facet, value):
+    if facet == "branch" and value == "":
+        return "(blank)"
+    return _LABELS.get(facet, {}).get(value, str(value))
+
+
+def has_table(conn):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'candidate_facets'"
+    ).fetchone() is not None
+
+
+def _add(conn, where, params=(), sign=1):
+    """Add (sign=1) or remove (sign=-1) the candidates matching where to the counts."""
+    conn.execute(f"""
+        INSERT INTO candidate_facets ({", ".join(_COLUMNS)}, n)
+        SELECT {", ".join(_EXPRS)}, {int(sign)} * COUNT(*)
+        FROM candidates c LEFT JOIN candidate_status s ON s.COAP = c.COAP
+        WHERE {where}
+        GROUP BY {", ".join(str(i + 1) for i in range(len(_COLUMNS)))}
+        ON CONFLICT ({", ".join(_COLUMNS)}) DO UPDATE SET n = n + excluded.n
+    """, params)
+    if sign < 0:
+        conn.execute("DELETE FROM candidate_facets WHERE n <= 0")
+
+
+def rebuild(conn):
+    """Recount every candidate."""
+    conn.execute("DELETE FROM candidate_facets")
+    _add(conn, "1")
+
+
+def add_candidates(conn, after_rowid):
+    """Count candidates with rowid > after_rowid (rows just ingested and coded)."""
+    if has_table(conn):
+        _add(conn, "c.rowid > ?", (after_rowid,))
+
+
+def max_rowid(conn):
+    return conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM candidates").fetchone()[0]
+
+
+def remove_coaps(conn, table):
+    """Take the candidates whose COAP is in temp table `table` out of the counts (before they change)."""
+    if has_table(conn):
+        _add(conn, f"c.COAP IN (SELECT key FROM {table})", sign=-1)
+
+
+def add_coaps(conn, table):
+    """Count the candidates whose COAP is in temp table `table` again (after they changed)."""
+    if has_table(conn):
+        _add(conn, f"c.COAP IN (SELECT key FROM {table})")
+
+
+# ---------------------------------------------------------------------------
+# Filters
+# ---------------------------------------------------------------------------
+def _in(expr, values, params):
+    params.extend(values)
+    return f"{expr} IN ({', '.join('?' * len(values))})"
+
+
+def _score_clauses(score_range, column, params, banded):
+    """Clauses for min <= score < max; max == SCORE_MAX also keeps the top score."""
+    if not score_range:
+        return []
+    low, high = score_range
+    clauses = []
+    if low > 0:
+        clauses.append(f"{column} >= ?")
+        params.append(low // SCORE_BAND if banded else low)
+    if high < SCORE_MAX:
+        clauses.append(f"{column} < ?")
+        params.append(high // SCORE_BAND if banded else high)
+    if banded and clauses:
+        clauses.append(f"{column} >= 0")
+    return clauses
+
+
+def candidate_where(filters, score_range=None):
+    """(where, params) selecting the filtered candidates as c; uses candidate_status only if needed."""
+    clauses, params = [], []
+    for name, values in filters.items():
+        if not values:
+            continue
+        _, _, expr = FACETS[name]
+        if name == "state":
+            expr = "COALESCE((SELECT s.state FROM candidate_status s WHERE s.COAP = c.COAP), 'none')"
+        clauses.append(_in(expr, sorted(values, key=str), params))
+    clauses += _score_clauses(score_range, "c.MaxGATEScore_3yrs", params, banded=False)
+    return " AND ".join(clauses), params
+
+
+def facet_where(filters, score_range=None, skip=None):
+    """(where, params) on candidate_facets for the filters, ignoring facet `skip`."""
+    clauses, params = [], []
+    for name, values in filters.items():
+        if values and name != skip:
+            clauses.append(_in(FACETS[name][1], sorted(values, key=str), params))
+    clauses += _score_clauses(score_range, "score_band", params, banded=True)
+    return (" AND ".join(clauses) or "1"), params
+
+
+def counts(conn, filters, score_range=None):
+    """
+    {facet: [(value, count), ...]} where each facet's counts apply every
+    other facet's filter (so ticking more values of one facet is visible),
+    plus the total under all filters as counts["total"].
+    """
+    result = {}
+    for name, (_, column, _) in FACETS.items():
+        where, params = facet_where(filters, score_range, skip=name)
+        result[name] = conn.execute(f"""
+            SELECT {column}, SUM(n) FROM candidate_facets WHERE {where}
+            GROUP BY {column} ORDER BY {column}
+        """, params).fetchall()
+    where, params = facet_where(filters, score_range)
+    result["total"] = conn.execute(
+        f"SELECT COALESCE(SUM(n), 0) FROM candidate_facets WHERE {where}", params).fetchone()[0]
+    return result
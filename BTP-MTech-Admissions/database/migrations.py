@@ -0,0 +1,187 @@
+# database/migrations.py
+"""
+Versioned, in-place schema migrations.
+
+The schema version is stored in SQLite's PRAGMA user_version.  upgrade()
+applies every migration newer than that version, each in its own
+transaction, so an existing mtech_offers.db is brought up to date on
+startup without re-running full_setup.py (which would wipe it).
+
+db_manager.get_connection() calls upgrade() the first time it opens a
+database file in a process.  To change the schema, append a new
+(version, description, steps) entry to MIGRATIONS -- never edit one that
+has shipped.  A step is either an SQL string or a function taking the
+connection.
+"""
+from database import browse, candidate_edits, candidate_history, candidate_search, candidate_status, decisions, facets, ingest, seat_codes, seat_ledger
+
+CANDIDATES_DDL = """
+    CREATE TABLE IF NOT EXISTS candidates (
+        Si_NO INTEGER,
+        App_no TEXT PRIMARY KEY,
+        Email TEXT,
+        Full_Name TEXT,
+        Adm_cat TEXT,
+        Pwd TEXT,
+        Ews TEXT,
+        Gender TEXT,
+        Category TEXT,
+        COAP TEXT,
+        GATE22RollNo TEXT,
+        GATE22Rank INTEGER,
+        GATE22Score REAL,
+        GATE22Disc TEXT,
+        GATE21RollNo TEXT,
+        GATE21Rank INTEGER,
+        GATE21Score REAL,
+        GATE21Disc TEXT,
+        GATE20RollNo TEXT,
+        GATE20Rank INTEGER,
+        GATE20Score REAL,
+        GATE20Disc TEXT,
+        MaxGATEScore_3yrs REAL,
+        HSSC_board TEXT,
+        HSSC_date TEXT,
+        HSSC_per REAL,
+        SSC_board TEXT,
+        SSC_date TEXT,
+        SSC_per REAL,
+        Degree_Qualification TEXT,
+        Degree_PassingDate TEXT,
+        Degree_Branch TEXT,
+        Degree_OtherBranch TEXT,
+        Degree_Institute TEXT,
+        Degree_CGPA_7th REAL,
+        Degree_CGPA_8th REAL,
+        Degree_Per_7th REAL,
+        Degree_Per_8th REAL,
+        ExtraColumn TEXT,
+        GATE_Roll_num TEXT
+    )
+"""
+
+SEAT_MATRIX_DDL = """
+    CREATE TABLE IF NOT EXISTS seat_matrix (
+        category TEXT PRIMARY KEY,
+        set_seats INTEGER DEFAULT 0,
+        seats_allocated INTEGER DEFAULT 0,
+        seats_booked INTEGER DEFAULT 0
+    )
+"""
+
+OFFERS_DDL = """
+    CREATE TABLE IF NOT EXISTS offers (
+        round_no INTEGER,
+        COAP TEXT,
+        Full_Name TEXT,
+        category TEXT,
+        MaxGATEScore_3yrs REAL,
+        offer_status TEXT,
+        PRIMARY KEY (round_no, COAP)
+    )
+"""
+
+MIGRATIONS = [
+    (1, "base schema (candidates, seat_matrix, offers)", [
+        CANDIDATES_DDL,
+        SEAT_MATRIX_DDL,
+        OFFERS_DDL,
+    ]),
+    (2, "indexes for eligibility, allocation and offer queries", [
+        # Joins / filters on COAP (offers, consolidated decisions, search)
+        "CREATE INDEX IF NOT EXISTS idx_candidates_coap ON candidates(COAP)",
+        # ORDER BY MaxGATEScore_3yrs DESC in run_round, WHERE ... IS NOT NULL
+        "CREATE INDEX IF NOT EXISTS idx_candidates_score ON candidates(MaxGATEScore_3yrs DESC)",
+        # offers: per-round scans grouped by category, and joins back on COAP
+        "CREATE INDEX IF NOT EXISTS idx_offers_round_category ON offers(round_no, category)",
+        "CREATE INDEX IF NOT EXISTS idx_offers_coap ON offers(COAP)",
+        "ANALYZE",
+    ]),
+    (3, "single decisions table replacing the per-round decision tables", [
+        *decisions.DECISIONS_DDL,
+        decisions.migrate_legacy_tables,
+        "ANALYZE",
+    ]),
+    (4, "materialised candidate_status for eligibility and retention", [
+        *candidate_status.STATUS_DDL,
+        candidate_status.rebuild,
+    ]),
+    (5, "seat_ledger of confirmed seats per round; seats_booked kept in sync", [
+        *seat_ledger.LEDGER_DDL,
+        seat_ledger.rebuild,
+    ]),
+    (6, "normalised seat columns on candidates (cat_code, is_female, is_pwd, seat keys)", [
+        *seat_codes.CODED_DDL,
+        seat_codes.fill_missing,
+        "ANALYZE",
+    ]),
+    (7, "data_versions change counters (export cache keys)", [
+        # Shipped DDL, inlined when the module was removed (dropped again by 14)
+        """
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """,
+        "INSERT OR IGNORE INTO data_versions (name) VALUES ('candidates')",
+    ]),
+    (8, "candidates_fts full-text search index, kept in sync by triggers", [
+        candidate_search.create_index,
+    ]),
+    (9, "indexes for the sorted candidate and offer browsers", [
+        *browse.BROWSE_INDEXES,
+        "ANALYZE",
+    ]),
+    (10, "candidate_facets counts for the faceted search filters", [
+        *facets.FACETS_DDL,
+        facets.rebuild,
+    ]),
+    (11, "candidate_history view (offers and decisions per candidate)", [
+        *candidate_history.HISTORY_DDL,
+    ]),
+    (12, "row_version on candidates for optimistic-concurrency edits", [
+        *candidate_edits.EDITS_DDL,
+    ]),
+    (13, "row_hash on candidates for delta re-imports", [
+        *ingest.HASH_DDL,
+    ]),
+    (14, "drop data_versions (the export cache keys on row content now)", [
+        "DROP TABLE IF EXISTS data_versions",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def upgrade(conn, progress=None):
+    """Apply all pending migrations. Returns the list of versions applied."""
+    applied = []
+    for version, description, steps in MIGRATIONS:
+        if version <= current_version(conn):
+            continue
+        if progress:
+            progress(f"Upgrading database to version {version}: {description}")
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have upgraded while we waited for the lock
+            if version <= current_version(conn):
+                conn.rollback()
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
@@ -0,0 +1,365 @@
+# database/offer_export.py
+"""
+Streaming export of a round's offers.
+
+Rows go straight from the SQLite cursor to the output file, fetchmany()
+batch by batch, so memory stays flat however many offers (and candidate
+columns) there are:
+
+    xlsx     openpyxl write-only workbook with the Offers_Summary and
+             Offers_Detailed sheets (RoundN_Offers.xlsx)
+    csv      one file per sheet (RoundN_Offers_Summary.csv, ..._Detailed.csv)
+    parquet  one file per sheet, written in row groups; needs pyarrow
+
+The detailed sheet holds every imported candidate column by default;
+pass columns=[...] (a subset of detail_columns()) to choose them.
+rounds_manager.download_offers() is the entry point used by the GUI and the
+command line.
+
+export_round_cached() keeps each export under CACHE_DIR, keyed by round
+number, format, columns and a hash of every row the export would write
+(summary and detailed), so a repeat download of an unchanged round is a
+file copy.  Reading the rows is cheap next to writing the workbook, and the
+key depends only on the contents: a recreated database or a change made
+outside the application can't be served an old file.  When the offers or
+candidate details change the key changes, and the round's old entry in that
+format is removed.
+
+export_all_rounds() renders every round in a pool of worker processes (each
+through the cache), adds an All_Rounds_Summary of every offer and bundles
+everything into one zip archive.
+"""
+import csv
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from database import candidate_edits, seat_codes
+from database.ingest import HASH_COLUMN, get_table_columns
+
+FORMATS = ("xlsx", "csv", "parquet")
+
+SUMMARY_SHEET = "Offers_Summary"
+DETAILED_SHEET = "Offers_Detailed"
+
+# Rows fetched from SQLite (and written) per batch
+BATCH_SIZE = 2000
+
+# Export cache, next to the database; bump CACHE_VERSION when the file layout changes
+CACHE_DIR = "export_cache"
+CACHE_VERSION = 1
+
+_SUMMARY_SELECT = ["o.round_no", "c.COAP", "o.Full_Name", "o.category", "o.MaxGATEScore_3yrs", "o.offer_status"]
+
+_FROM = """
+    FROM offers o
+    JOIN candidates c ON o.COAP = c.COAP
+"""
+
+
+def _where(round_no):
+    """WHERE clause and parameters for one round, or for every round when round_no is None."""
+    if round_no is None:
+        return "", {}
+    return "WHERE o.round_no = :round_no", {"round_no": round_no}
+
+
+class ExportError(ValueError):
+    """The export could not be written as requested (unknown column, missing pyarrow...)."""
+
+
+def detail_columns(conn):
+    """Candidate columns available for the detailed sheet, as imported (not the coded seat columns)."""
+    internal = [*seat_codes.CODED_COLUMNS, candidate_edits.VERSION_COLUMN, HASH_COLUMN]
+    return [col for col in get_table_columns(conn.cursor()) if col not in internal]
+
+
+def _sheets(conn, round_no, columns=None):
+    """[(sheet name, header, select expressions, ORDER BY)] for one round."""
+    available = detail_columns(conn)
+    if columns is None:
+        columns = available
+    unknown = [col for col in columns if col not in available]
+    if unknown:
+        raise ExportError(f"Unknown candidate column(s): {', '.join(unknown)}")
+    return [
+        (SUMMARY_SHEET, [expr.split(".")[1] for expr in _SUMMARY_SELECT], _SUMMARY_SELECT, ""),
+        (DETAILED_SHEET, ["round_no", *columns], ["o.round_no", *(f'c."{col}"' for col in columns)],
+         "ORDER BY o.MaxGATEScore_3yrs DESC"),
+    ]
+
+
+def _batches(conn, select, order_by, round_no):
+    where, params = _where(round_no)
+    cursor = conn.execute(f"SELECT {', '.join(select)} {_FROM} {where} {order_by}", params)
+    try:
+        while True:
+            batch = cursor.fetchmany(BATCH_SIZE)
+            if not batch:
+                return
+            yield batch
+    finally:
+        cursor.close()
+
+
+def _counted(batches, sheet, progress):
+    """Pass batches through, reporting the running row count (which also lets a job be cancelled)."""
+    done = 0
+    for batch in batches:
+        yield batch
+        done += len(batch)
+        if progress:
+            progress(f"{sheet}: {done} rows written...")
+
+
+# ---------- Writers ----------
+def _write_xlsx(paths, sheets):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    try:
+        for name, header, batches, _ in sheets:
+            ws = wb.create_sheet(name)
+            ws.append(header)
+            for batch in batches:
+                for row in batch:
+                    ws.append(row)
+        wb.save(paths[0])
+    finally:
+        wb.close()
+    return paths
+
+
+def _write_csv(paths, sheets):
+    for path, (name, header, batches, _) in zip(paths, sheets):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for batch in batches:
+                writer.writerows(batch)
+    return paths
+
+
+def _arrow_type(pa, sqlite_types):
+    """Arrow type for a column from the SQLite storage classes found in it."""
+    sqlite_types = set(sqlite_types) - {"null"}
+    if sqlite_types == {"integer"}:
+        return pa.int64()
+    if sqlite_types and sqlite_types <= {"integer", "real"}:
+        return pa.float64()
+    return pa.string()
+
+
+def _column_types(conn, select, round_no):
+    """[{storage classes}] per selected expression, over the rows being exported."""
+    where, params = _where(round_no)
+    row = conn.execute(
+        f"SELECT {', '.join(f'GROUP_CONCAT(DISTINCT typeof({expr}))' for expr in select)} {_FROM} {where}",
+        params,
+    ).fetchone()
+    return [(value or "").split(",") for value in row]
+
+
+def _write_parquet(paths, sheets):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportError("Parquet export needs the pyarrow package (pip install pyarrow).") from None
+
+    for path, (name, header, batches, types) in zip(paths, sheets):
+        schema = pa.schema([(col, _arrow_type(pa, t)) for col, t in zip(header, types)])
+        as_text = [pa.types.is_string(field.type) for field in schema]
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch in batches:
+                arrays = [
+                    pa.array([None if v is None else str(v) for v in values] if text else list(values),
+                             type=field.type)
+                    for values, field, text in zip(zip(*batch), schema, as_text)
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+    return paths
+
+
+_WRITERS = {"xlsx": _write_xlsx, "csv": _write_csv, "parquet": _write_parquet}
+
+
+# ---------- Entry point ----------
+def output_names(round_no, fmt="xlsx"):
+    """File names an export of round_no in fmt consists of, in sheet order."""
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown export format {fmt!r}; choose one of {', '.join(FORMATS)}")
+    if fmt == "xlsx":
+        return [f"Round{round_no}_Offers.xlsx"]
+    return [f"Round{round_no}_{sheet}.{fmt}" for sheet in (SUMMARY_SHEET, DETAILED_SHEET)]
+
+
+def export_round(conn, round_no, fmt="xlsx", columns=None, directory=".", progress=None):
+    """
+    Write the offers of round_no in format fmt (see FORMATS) under directory.
+    Returns the list of files written.
+    """
+    paths = [os.path.normpath(os.path.join(directory, name)) for name in output_names(round_no, fmt)]
+
+    sheets = []
+    for name, header, select, order_by in _sheets(conn, round_no, columns):
+        types = _column_types(conn, select, round_no) if fmt == "parquet" else None
+        batches = _counted(_batches(conn, select, order_by, round_no), name, progress)
+        sheets.append((name, header, batches, types))
+
+    return _WRITERS[fmt](paths, sheets)
+
+
+# ---------- Cache ----------
+def content_key(conn, round_no, fmt="xlsx", columns=None, progress=None):
+    """
+    Hash identifying an export of round_no: format, headers and every row of
+    every sheet, in the order they would be written.
+    """
+    sheets = _sheets(conn, round_no, columns)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((CACHE_VERSION, fmt, round_no, [(name, header) for name, header, _, _ in sheets])).encode())
+    for name, _, select, order_by in sheets:
+        digest.update(name.encode())
+        for batch in _batches(conn, select, order_by, round_no):
+            # repr, not marshal: marshal's output depends on refcounts and string interning
+            digest.update(repr(batch).encode())
+            if progress:
+                progress(f"Checking Round {round_no} offers...")
+    return digest.hexdigest()
+
+
+def export_round_cached(conn, round_no, fmt="xlsx", columns=None, directory=".", progress=None,
+                        cache_dir=CACHE_DIR):
+    """
+    export_round() through the on-disk cache: reuse the files of an identical
+    earlier export, otherwise write them into the cache first. Returns the
+    files copied to directory.
+    """
+    key = f"{fmt}-{content_key(conn, round_no, fmt, columns, progress)}"
+    round_dir = os.path.join(cache_dir, f"round{round_no}")
+    entry = os.path.join(round_dir, key)
+
+    if os.path.isdir(entry):
+        if progress:
+            progress(f"Round {round_no} offers unchanged; using cached export...")
+    else:
+        os.makedirs(round_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f".{key}-", dir=round_dir)
+        try:
+            export_round(conn, round_no, fmt=fmt, columns=columns, directory=staging, progress=progress)
+            os.rename(staging, entry)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            # Another export may have cached the same contents meanwhile
+            if not os.path.isdir(entry):
+                raise
+        # Entries for older contents of this round (in this format) can't be asked for again
+        for name in os.listdir(round_dir):
+            if name != key and name.startswith(f"{fmt}-"):
+                shutil.rmtree(os.path.join(round_dir, name), ignore_errors=True)
+
+    os.makedirs(directory, exist_ok=True)
+    written = []
+    for name in output_names(round_no, fmt):
+        path = os.path.normpath(os.path.join(directory, name))
+        shutil.copyfile(os.path.join(entry, name), path)
+        written.append(path)
+    return written
+
+
+# ---------- All rounds ----------
+ALL_ROUNDS_SUMMARY = "All_Rounds_Summary"
+
+
+def _export_round_in_worker(db_path, round_no, fmt, columns, directory, cache_dir):
+    """Process pool entry point: export one round on the worker's own connection."""
+    from database import db_manager
+    conn = db_manager.get_connection(db_path)
+    try:
+        return export_round_cached(conn, round_no, fmt=fmt, columns=columns,
+                                   directory=directory, cache_dir=cache_dir)
+    finally:
+        db_manager.close_connection(db_path)
+
+
+def _write_summary_in_worker(db_path, fmt, directory):
+    """Process pool entry point: every offer of every round in one summary sheet (file), by round."""
+    from database import db_manager
+    conn = db_manager.get_connection(db_path)
+    try:
+        header = [expr.split(".")[1] for expr in _SUMMARY_SELECT]
+        types = _column_types(conn, _SUMMARY_SELECT, None) if fmt == "parquet" else None
+        batches = _batches(conn, _SUMMARY_SELECT, "ORDER BY o.round_no, o.rowid", None)
+        path = os.path.join(directory, f"{ALL_ROUNDS_SUMMARY}.{fmt}")
+        return _WRITERS[fmt]([path], [(ALL_ROUNDS_SUMMARY, header, batches, types)])
+    finally:
+        db_manager.close_connection(db_path)
+
+
+def _run_tasks(tasks, workers, progress):
+    """Run {label: (fn, *args)} in a spawn-based process pool (inline for one worker); yields results."""
+    if workers <= 1:
+        for done, (label, (fn, *args)) in enumerate(tasks.items(), 1):
+            yield fn(*args)
+            if progress:
+                progress(f"{label} exported ({done}/{len(tasks)})")
+        return
+
+    # spawn, not fork: the GUI calls this from a worker thread of a Qt process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(fn, *args): label for label, (fn, *args) in tasks.items()}
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                yield future.result()
+                if progress:
+                    progress(f"{futures[future]} exported ({done}/{len(tasks)})")
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+
+
+def export_all_rounds(conn, db_path, fmt="xlsx", columns=None, directory=".", progress=None,
+                      workers=None, cache_dir=CACHE_DIR):
+    """
+    Export every generated round, and the combined summary, in parallel
+    worker processes and bundle the files into All_Rounds_Offers.zip under
+    directory. workers defaults to one per CPU. Returns (zip path, rounds exported).
+    """
+    rounds = [r for (r,) in conn.execute("SELECT DISTINCT round_no FROM offers ORDER BY round_no")]
+    if not rounds:
+        return None, []
+    output_names(rounds[0], fmt)  # validates fmt before any process starts
+    _sheets(conn, rounds[0], columns)  # ...and the columns
+
+    os.makedirs(directory, exist_ok=True)
+    archive = os.path.normpath(os.path.join(directory, "All_Rounds_Offers.zip"))
+    # Absolute paths: worker processes need not share our working directory
+    staging = os.path.abspath(tempfile.mkdtemp(prefix=".all-rounds-", dir=directory))
+    db_path, cache_dir = os.path.abspath(db_path), os.path.abspath(cache_dir)
+    try:
+        tasks = {ALL_ROUNDS_SUMMARY: (_write_summary_in_worker, db_path, fmt, staging)}
+        for r in rounds:
+            tasks[f"Round {r}"] = (_export_round_in_worker, db_path, r, fmt, columns, staging, cache_dir)
+        workers = min(len(tasks), workers or os.cpu_count() or 1)
+        if progress:
+            progress(f"Exporting {len(rounds)} rounds...")
+        files = [path for paths in _run_tasks(tasks, workers, progress) for path in paths]
+
+        if progress:
+            progress(f"Writing {os.path.basename(archive)}...")
+        # xlsx / parquet are compressed already
+        compress = zipfile.ZIP_DEFLATED if fmt == "csv" else zipfile.ZIP_STORED
+        partial = os.path.join(staging, os.path.basename(archive))
+        with zipfile.ZipFile(partial, "w") as zf:
+            for path in sorted(files):
+                zf.write(path, os.path.basename(path), compress_type=compress)
+        os.replace(partial, archive)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return archive, rounds
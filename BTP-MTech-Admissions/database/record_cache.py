@@ -0,0 +1,108 @@
+# database/record_cache.py
+"""
+Process-wide LRU cache of candidate records (candidate_history rows and
+their round timelines) keyed by COAP, shared by the search page and the
+Update dialog.
+
+Search results are prefetched in one query (prefetch()), so opening a hit's
+details -- and reopening it later -- reads nothing from the database.
+Entries are dropped by the code that writes:
+
+    ingest / insert_candidate          clear()
+    delta import (ingest, delta=True)  invalidate(the updated COAPs)
+    candidate_edits.apply_edits()      invalidate(the edited COAPs)
+    candidate_status.refresh()         invalidate(the COAPs it recomputed)
+    (round generation, decision uploads and resets all go through it)
+    candidate_status.rebuild()         clear()
+
+Writes committed through another connection (a background job's thread,
+the command line in another process) are caught with PRAGMA data_version,
+which changes when anyone but the connection itself commits: the cache is
+cleared the next time a lookup sees it move.
+"""
+import threading
+from collections import OrderedDict
+
+from database import candidate_history
+
+CACHE_SIZE = 2000
+
+_lock = threading.Lock()
+_entries = OrderedDict()    # COAP -> {"record": dict, "timeline": list | None}
+_seen_versions = {}         # open connection (db_manager's per-thread pool) -> PRAGMA data_version
+
+
+def _check(conn):
+    """Clear everything if another connection committed since conn's last lookup."""
+    version = conn.execute("PRAGMA data_version").fetchone()[0]
+    with _lock:
+        if conn in _seen_versions and _seen_versions[conn] != version:
+            _entries.clear()
+        _seen_versions[conn] = version
+
+
+def forget(conn):
+    """Drop what is remembered about conn; db_manager calls this when it closes one."""
+    with _lock:
+        _seen_versions.pop(conn, None)
+
+
+def _store(coap, record):
+    with _lock:
+        _entries[coap] = {"record": record, "timeline": None}
+        _entries.move_to_end(coap)
+        while len(_entries) > CACHE_SIZE:
+            _entries.popitem(last=False)
+
+
+def _cached(coap):
+    with _lock:
+        entry = _entries.get(coap)
+        if entry is not None:
+            _entries.move_to_end(coap)
+        return entry
+
+
+def record(conn, coap):
+    """candidate_history row of this COAP as a dict ({} if unknown). Treat it as read-only."""
+    _check(conn)
+    entry = _cached(coap)
+    if entry is not None:
+        return entry["record"]
+    rec = candidate_history.record(conn, coap)
+    if rec:
+        _store(coap, rec)
+    return rec
+
+
+def timeline(conn, coap):
+    """candidate_history.timeline() of this COAP, cached alongside its record."""
+    rec = record(conn, coap)
+    if not rec:
+        return []
+    entry = _cached(coap)
+    if entry is None:
+        return candidate_history.timeline(conn, coap, rec.get("App_no"))
+    if entry["timeline"] is None:
+        entry["timeline"] = candidate_history.timeline(conn, coap, rec.get("App_no"))
+    return entry["timeline"]
+
+
+def prefetch(conn, coaps):
+    """Load the records of the COAPs not cached yet in one query (e.g. for a page of search hits)."""
+    _check(conn)
+    with _lock:
+        missing = [coap for coap in dict.fromkeys(coaps) if coap and coap not in _entries]
+    for coap, rec in candidate_history.records(conn, missing).items():
+        _store(coap, rec)
+
+
+def invalidate(coaps):
+    with _lock:
+        for coap in coaps:
+            _entries.pop(coap, None)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,102 @@
+# database/seat_codes.py
+"""
+Normalised seat columns on candidates, computed once when rows are ingested
+instead of on every round:
+
+    cat_code      base category as a small integer (CATEGORY_CODES; EWS
+                  candidates are coded EWS, unknown categories are NULL)
+    is_female     1 / 0
+    is_pwd        1 / 0
+    seat_key      first seat key the candidate tries, e.g. OBC_Female_PWD
+    seat_key_alt  fallback seat key (women only), e.g. OBC_FandM_PWD
+
+The raw Category / Gender / Ews / Pwd columns are left untouched.  The rules
+are engine.allocation.normalize() and seat_keys().  Imports write the codes
+in the same INSERT as the row (coded_rows()); fill_missing() codes rows that
+were stored without them (the migration, legacy databases).
+"""
+from functools import lru_cache
+
+from database import db_manager
+from engine import allocation
+
+CATEGORY_CODES = {"GEN": 0, "OBC": 1, "SC": 2, "ST": 3, "EWS": 4}
+CATEGORY_NAMES = {code: name for name, code in CATEGORY_CODES.items()}
+
+CODED_COLUMNS = ["cat_code", "is_female", "is_pwd", "seat_key", "seat_key_alt"]
+
+# Raw columns the codes are computed from, in encode() argument order
+SOURCE_COLUMNS = ["Category", "Gender", "Ews", "Pwd"]
+
+CODED_DDL = [
+    "ALTER TABLE candidates ADD COLUMN cat_code INTEGER",
+    "ALTER TABLE candidates ADD COLUMN is_female INTEGER",
+    "ALTER TABLE candidates ADD COLUMN is_pwd INTEGER",
+    "ALTER TABLE candidates ADD COLUMN seat_key TEXT",
+    "ALTER TABLE candidates ADD COLUMN seat_key_alt TEXT",
+    # One bucket per seat_key, read in merit order by run_round
+    "CREATE INDEX IF NOT EXISTS idx_candidates_seat ON candidates(seat_key, MaxGATEScore_3yrs DESC)",
+    # Category / gender / PWD filters and counts
+    "CREATE INDEX IF NOT EXISTS idx_candidates_codes ON candidates(cat_code, is_female, is_pwd)",
+]
+
+
+# Only a few dozen distinct inputs occur, so an import encodes each once
+@lru_cache(maxsize=1024)
+def encode(category, gender, ews, pwd):
+    """(cat_code, is_female, is_pwd, seat_key, seat_key_alt) for one candidate."""
+    base, female, is_pwd = allocation.normalize(category, gender, ews, pwd)
+    keys = allocation.seat_keys(base, female, is_pwd)
+    return (
+        CATEGORY_CODES.get(base),
+        int(female),
+        int(is_pwd),
+        keys[0],
+        keys[1] if len(keys) > 1 else None,
+    )
+
+
+def coded_rows(columns, rows):
+    """
+    rows (tuples ordered like columns) with their CODED_COLUMNS values
+    appended, for an INSERT over columns + CODED_COLUMNS.  Source columns
+    missing from columns count as blank.
+    """
+    positions = [columns.index(col) if col in columns else None for col in SOURCE_COLUMNS]
+    if None not in positions:
+        cat, gender, ews, pwd = positions
+        return [(*row, *encode(row[cat], row[gender], row[ews], row[pwd])) for row in rows]
+    return [(*row, *encode(*(None if pos is None else row[pos] for pos in positions))) for row in rows]
+
+
+_UPDATE_SQL = """
+    UPDATE candidates
+    SET cat_code = ?, is_female = ?, is_pwd = ?, seat_key = ?, seat_key_alt = ?
+    WHERE rowid = ?
+"""
+
+
+def _update(conn, rows):
+    conn.executemany(_UPDATE_SQL, (
+        (*encode(category, gender, ews, pwd), rowid)
+        for rowid, category, gender, ews, pwd in rows
+    ))
+
+
+def fill_missing(conn):
+    """Code every candidate that has no seat_key yet (rows stored before the codes existed)."""
+    rows = conn.execute(
+        "SELECT rowid, Category, Gender, Ews, Pwd FROM candidates WHERE seat_key IS NULL"
+    ).fetchall()
+    _update(conn, rows)
+    return len(rows)
+
+
+def refresh(conn, coaps):
+    """Re-code the given candidates after their Category / Gender / Ews / Pwd changed."""
+    table = db_manager.load_temp_keys(conn, "seat_code_coaps", coaps)
+    rows = conn.execute(f"""
+        SELECT c.rowid, c.Category, c.Gender, c.Ews, c.Pwd
+        FROM candidates c JOIN {table} t ON t.key = c.COAP
+    """).fetchall()
+    _update(conn, rows)
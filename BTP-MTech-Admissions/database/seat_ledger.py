@@ -0,0 +1,141 @@
+# database/seat_ledger.py
+"""
+Running ledger of confirmed seats.
+
+seat_ledger(round_no, category, confirmed) holds, per round, how many of that
+round's offers were accepted and frozen at IIT Goa.  A round's rows are
+recomputed when its IIT Goa decisions are saved or cleared, or when the
+round is (re)allocated, and seat_matrix.seats_booked is kept equal to the
+ledger total per category.  Loading the confirmed seats for a new round is
+then a read of seat_matrix instead of a join per previous round.
+
+seat_matrix.seats_allocated holds the seats in use after the latest round
+was allocated (confirmed seats plus that round's offers).
+"""
+from database import db_manager, decisions
+
+# Columns read from an uploaded seat matrix workbook
+EXPECTED_COLUMNS = ["category", "set_seats"]
+
+LEDGER_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS seat_ledger (
+        round_no INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        confirmed INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (round_no, category)
+    ) WITHOUT ROWID
+    """,
+]
+
+# Confirmed offers per (round, category); rounds between :first and :last
+_CONFIRMED_SQL = """
+    INSERT INTO seat_ledger (round_no, category, confirmed)
+    SELECT o.round_no, TRIM(o.category), COUNT(o.COAP)
+    FROM decisions d
+    JOIN candidates c ON c.App_no = d.key
+    JOIN offers o ON o.COAP = c.COAP AND o.round_no = d.round_no
+    WHERE d.source = :goa AND d.decision = :freeze
+      AND d.round_no BETWEEN :first AND :last
+      AND o.category IS NOT NULL
+    GROUP BY o.round_no, TRIM(o.category)
+"""
+
+
+def _insert_confirmed(conn, first, last):
+    conn.execute(_CONFIRMED_SQL, {
+        "goa": decisions.IIT_GOA, "freeze": decisions.ACCEPT_AND_FREEZE,
+        "first": first, "last": last,
+    })
+
+
+def sync_booked(conn):
+    """Set seat_matrix.seats_booked to the ledger total of each category."""
+    conn.execute("""
+        UPDATE seat_matrix
+        SET seats_booked = COALESCE(
+            (SELECT SUM(l.confirmed) FROM seat_ledger l WHERE l.category = TRIM(seat_matrix.category)), 0)
+    """)
+
+
+def refresh_round(conn, round_no):
+    """Recompute the ledger rows of one round. Runs inside the caller's transaction."""
+    conn.execute("DELETE FROM seat_ledger WHERE round_no = ?", (round_no,))
+    _insert_confirmed(conn, round_no, round_no)
+    sync_booked(conn)
+
+
+def rebuild(conn):
+    """Recompute the whole ledger from decisions and offers."""
+    conn.execute("DELETE FROM seat_ledger")
+    _insert_confirmed(conn, 1, 2 ** 31)
+    sync_booked(conn)
+
+
+def confirmed_totals(conn, up_to_round):
+    """{category: seats confirmed in rounds 1..up_to_round}."""
+    if up_to_round < 1:
+        return {}
+    latest = conn.execute("SELECT MAX(round_no) FROM seat_ledger").fetchone()[0]
+    if latest is None:
+        return {}
+    if latest <= up_to_round:
+        # Nothing newer in the ledger: the running totals are already in seat_matrix
+        rows = conn.execute("SELECT TRIM(category), seats_booked FROM seat_matrix WHERE seats_booked > 0")
+    else:
+        # Re-running an earlier round: only count the rounds before it
+        rows = conn.execute("""
+            SELECT category, SUM(confirmed) FROM seat_ledger
+            WHERE round_no <= ? GROUP BY category
+        """, (up_to_round,))
+    return {cat: count for cat, count in rows}
+
+
+def record_allocated(conn, allocated):
+    """Store the per-category seats in use ({category: count}) after a round."""
+    conn.execute("UPDATE seat_matrix SET seats_allocated = 0")
+    conn.executemany(
+        "UPDATE seat_matrix SET seats_allocated = ? WHERE TRIM(category) = ?",
+        [(count, cat) for cat, count in allocated.items()]
+    )
+
+
+def save_set_seats(conn, rows):
+    """
+    Save (category, set_seats) rows.  seats_allocated / seats_booked are
+    maintained by the application and are not overwritten.
+    """
+    conn.executemany("""
+        INSERT INTO seat_matrix (category, set_seats) VALUES (?, ?)
+        ON CONFLICT(category) DO UPDATE SET set_seats = excluded.set_seats
+    """, rows)
+    sync_booked(conn)
+
+
+class SeatMatrixFormatError(ValueError):
+    """The seat matrix workbook lacks the expected columns."""
+
+
+def load_seat_matrix_file(path, progress=None):
+    """
+    Read a seat matrix workbook and write its seat counts to seat_matrix. Returns rows written.
+
+    Only category and set_seats are read; seats allocated / booked come from
+    the rounds run so far (the ledger above).
+    """
+    import pandas as pd  # only needed here; keeps the CLI's other commands light
+
+    if progress:
+        progress("Reading seat matrix...")
+    df = pd.read_excel(path)
+    if not all(col in df.columns for col in EXPECTED_COLUMNS):
+        raise SeatMatrixFormatError(f"Excel must contain: {', '.join(EXPECTED_COLUMNS)}")
+
+    df = df[EXPECTED_COLUMNS].fillna(0)
+    rows = [(str(row["category"]).strip(), int(row["set_seats"])) for row in df.to_dict("records")]
+
+    if progress:
+        progress("Saving seat matrix...")
+    with db_manager.transaction() as conn:
+        save_set_seats(conn, rows)
+    return len(rows)
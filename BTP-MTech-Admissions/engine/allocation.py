@@ -0,0 +1,216 @@
+# engine/allocation.py
+"""
+Seat allocation for one round, independent of Qt and of the database.
+
+Candidates are grouped into buckets by their seat keys (seat_key,
+seat_key_alt, pwd), each bucket an iterator in merit order (highest GATE
+score first, ties by rank).  A seat key such as GEN_Female or OBC_FandM_PWD
+can only ever be filled from a couple of buckets, so each key is filled by
+popping from its buckets' queues until the key is full; candidates who
+don't get a seat are never looked at, and buckets can be lazy (run_round
+reads each one from an index on candidates.seat_key).  The result is the same as taking
+every candidate in merit order and trying their seat keys in turn:
+
+    1. retained candidates are re-offered the category they hold
+    2. if COMMON_PWD has seats, the top PWD candidate gets a general seat
+    3. PWD candidates:      B_Female_PWD (women only), then B_FandM_PWD
+    4. everyone else:       B_Female (women only), then B_FandM
+
+where B is EWS for EWS candidates and the candidate's category otherwise.
+rounds_manager.run_round() loads the inputs and saves the offers.
+"""
+import heapq
+from collections import Counter, namedtuple
+
+STATUS_RETAINED = "Offered (Retained)"
+STATUS_COMMON_PWD = "Offered (Common PWD)"
+STATUS_PWD = "Offered (PWD)"
+STATUS_OFFERED = "Offered"
+
+# seat_key / seat_key_alt: first and fallback seat key (see seat_keys());
+# rank orders candidates with equal scores (lower rank = earlier)
+Applicant = namedtuple("Applicant", "coap name score seat_key seat_key_alt pwd rank")
+
+# Same column order as the offers table
+Offer = namedtuple("Offer", "round_no coap name category score status")
+
+
+def normalize(category, gender, ews, pwd):
+    """(base, female, pwd) from the raw candidate columns, with the defaults used for blanks."""
+    category = category.strip() if category else "GEN"
+    gender = gender.strip().capitalize() if gender else "Male"
+    ews = ews.strip().capitalize() if ews else "No"
+    base = "EWS" if ews == "Yes" else category
+    return base, gender == "Female", (pwd or "").strip().capitalize() == "Yes"
+
+
+def seat_keys(base, female, pwd):
+    """Seat keys a candidate tries, in order: [primary] or [primary, fallback]."""
+    suffix = "_PWD" if pwd else ""
+    if female:
+        return [f"{base}_Female{suffix}", f"{base}_FandM{suffix}"]
+    return [f"{base}_FandM{suffix}"]
+
+
+def make_applicant(coap, name, score, category, gender, ews, pwd, rank):
+    """Applicant from the raw candidate columns (database/seat_codes.py stores the same keys)."""
+    base, female, is_pwd = normalize(category, gender, ews, pwd)
+    keys = seat_keys(base, female, is_pwd) + [None]
+    return Applicant(coap, name, score, keys[0], keys[1], is_pwd, rank)
+
+
+def _without_pwd(key):
+    return key[:-len("_PWD")] if key and key.endswith("_PWD") else key
+
+
+def make_buckets(applicants):
+    """
+    Group applicants (already in merit order) into {(seat_key, seat_key_alt, pwd): [applicants]}.
+    A COAP listed more than once is only considered with its first (highest-merit) row.
+    """
+    buckets = {}
+    seen = set()
+    for a in applicants:
+        if a.coap in seen:
+            continue
+        seen.add(a.coap)
+        buckets.setdefault((a.seat_key, a.seat_key_alt, a.pwd), []).append(a)
+    return buckets
+
+
+class _Queue:
+    """Peekable merit-order iterator over one or more buckets, skipping candidates already placed."""
+
+    def __init__(self, iterables, placed):
+        self._it = heapq.merge(*iterables, key=_merit) if len(iterables) > 1 else iter(iterables[0])
+        self._placed = placed
+        self._head = None
+
+    def peek(self):
+        while self._head is None:
+            a = next(self._it, None)
+            if a is None:
+                return None
+            if a.coap not in self._placed:
+                self._head = a
+        return self._head
+
+    def pop(self):
+        a = self.peek()
+        self._head = None
+        return a
+
+
+def _merit(a):
+    return (-(a.score or 0), a.rank)
+
+
+class RoundAllocation:
+    """Seat allocation state for one round: call allocate(), then read offers / seats / counters."""
+
+    def __init__(self, round_no, seats, common_pwd_quota=0):
+        """seats: {key: {"total": n, "allocated": already confirmed}} (copied, not modified)."""
+        self.round_no = round_no
+        self.seats = {k: dict(v) for k, v in seats.items()}
+        self.common_pwd_quota = common_pwd_quota
+        self.offers = []
+        self.placed = set()
+        # (seat key, status) -> number of candidates, instead of logging each one
+        self.counters = Counter()
+
+    def _has_room(self, key):
+        seat = self.seats.get(key)
+        return seat is not None and seat["allocated"] < seat["total"]
+
+    def _offer(self, a, key, status):
+        self.seats[key]["allocated"] += 1
+        self.offers.append(Offer(self.round_no, a.coap, a.name, key, a.score, status))
+        self.placed.add(a.coap)
+        self.counters[(key, status)] += 1
+
+    def _fill(self, key, queue, status):
+        while self._has_room(key):
+            a = queue.pop()
+            if a is None:
+                break
+            self._offer(a, key, status)
+
+    def allocate(self, buckets, retained=()):
+        """
+        buckets:  {(seat_key, seat_key_alt, pwd): iterable of Applicant in merit order}
+        retained: [(Applicant, category)] in merit order
+        Returns the list of Offers made.
+        """
+        # 1. Retained candidates keep their seat (if it is still free)
+        for a, category in retained:
+            if a.coap in self.placed:
+                continue
+            if self._has_room(category):
+                self._offer(a, category, STATUS_RETAINED)
+            else:
+                self.counters[(category, "retained seat unavailable")] += 1
+
+        queues = {group: _Queue([bucket], self.placed) for group, bucket in buckets.items()}
+
+        # 2. COMMON_PWD: only the single top PWD candidate is considered
+        if self.common_pwd_quota > 0:
+            heads = [(q.peek(), group) for group, q in queues.items() if group[2]]
+            heads = [(a, group) for a, group in heads if a is not None]
+            if heads:
+                top, group = min(heads, key=lambda h: _merit(h[0]))
+                for key in (_without_pwd(top.seat_key), _without_pwd(top.seat_key_alt)):
+                    if key and self._has_room(key):
+                        queues[group].pop()
+                        self._offer(top, key, STATUS_COMMON_PWD)
+                        break
+
+        # 3./4. Keys that are only ever a first choice (B_Female...) fill first;
+        # then each other key from its own bucket plus the buckets falling back to it
+        for pwd, status in ((True, STATUS_PWD), (False, STATUS_OFFERED)):
+            groups = sorted((g for g in queues if g[2] == pwd), key=lambda g: (g[0], g[1] or ""))
+            for group in groups:
+                if group[1] is not None:
+                    self._fill(group[0], queues[group], status)
+            targets = sorted({g[0] for g in groups if g[1] is None} | {g[1] for g in groups if g[1] is not None})
+            for key in targets:
+                sources = [queues[g] for g in groups if (g[0] == key and g[1] is None) or g[1] == key]
+                self._fill(key, _Queue([_drain(q) for q in sources], self.placed), status)
+        return self.offers
+
+    def allocated_counts(self):
+        return {k: v["allocated"] for k, v in self.seats.items()}
+
+    def bucket_summary(self):
+        """[(seat key, {status: count}, seats allocated, seats total)] for keys with seats or events."""
+        by_key = {}
+        for (key, status), count in self.counters.items():
+            by_key.setdefault(key, {})[status] = count
+        summary = []
+        for key in sorted(set(self.seats) | set(by_key)):
+            seat = self.seats.get(key, {"allocated": 0, "total": 0})
+            if seat["total"] or key in by_key:
+                summary.append((key, by_key.get(key, {}), seat["allocated"], seat["total"]))
+        return summary
+
+
+def _drain(queue):
+    while True:
+        a = queue.pop()
+        if a is None:
+            return
+        yield a
+
+
+def allocate_round(round_no, applicants, seats, retained=None, common_pwd_quota=0):
+    """
+    Convenience wrapper: allocate one round from applicants in merit order.
+    retained: {COAP: category held}. Returns the RoundAllocation.
+    """
+    applicants = list(applicants)
+    retained = retained or {}
+    allocation = RoundAllocation(round_no, seats, common_pwd_quota)
+    allocation.allocate(
+        make_buckets(applicants),
+        [(a, retained[a.coap]) for a in applicants if a.coap in retained],
+    )
+    return allocation
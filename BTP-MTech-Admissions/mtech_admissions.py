@@ -0,0 +1,167 @@
+# mtech_admissions.py
+"""
+Command-line entry point for running admissions without the GUI.
+
+    python -m mtech_admissions ingest ApplicantData.xlsx
+    python -m mtech_admissions ingest --delta CorrectedApplicantData.xlsx
+    python -m mtech_admissions seat-matrix SeatMatrix.xlsx
+    python -m mtech_admissions decisions 1 --iit-goa goa.xlsx --other other.xlsx --consolidated cons.xlsx
+    python -m mtech_admissions run-round 2
+    python -m mtech_admissions export 2
+    python -m mtech_admissions export-all --format csv
+    python -m mtech_admissions status
+
+Run it from the application directory: like main.py it works on
+mtech_offers.db in the current directory.  Nothing here imports Qt, and
+pandas is only loaded by the commands that read spreadsheets
+(seat-matrix, decisions and .xls ingest).
+"""
+import argparse
+import os
+import sys
+
+from utils.app_logging import get_logger, setup_logging
+
+log = get_logger("cli")
+
+
+def _print_progress(message):
+    print(f"  {message}")
+
+
+def _print_rows(done, total):
+    print(f"  {done}/{total or '?'} rows processed")
+
+
+# ---------- Commands ----------
+def cmd_ingest(args):
+    from database.ingest import ingest_applicant_excel
+    result = ingest_applicant_excel(args.file, progress=_print_rows, delta=args.delta)
+    if args.delta:
+        print(f"Candidates: {result}.")
+    else:
+        print(f"{result} candidates inserted.")
+
+
+def cmd_seat_matrix(args):
+    from database.seat_ledger import load_seat_matrix_file
+    count = load_seat_matrix_file(args.file, progress=_print_progress)
+    print(f"Seat matrix saved ({count} categories).")
+
+
+def cmd_decisions(args):
+    from ui.rounds_manager import upload_round_decisions
+    upload_round_decisions(args.round, args.iit_goa, args.other, args.consolidated,
+                           progress=_print_progress)
+    print(f"Round {args.round} decisions saved.")
+
+
+def cmd_run_round(args):
+    from ui.rounds_manager import run_round
+    offers = run_round(args.round, progress=_print_progress)
+    print(f"Round {args.round} allocation complete. Total offers: {offers}")
+
+
+def cmd_export(args):
+    from ui.rounds_manager import download_offers
+    columns = [col.strip() for col in args.columns.split(",")] if args.columns else None
+    filenames = download_offers(args.round, progress=_print_progress, fmt=args.format,
+                                columns=columns, directory=args.output_dir)
+    print(f"Offers saved as {', '.join(filenames)}")
+
+
+def cmd_export_all(args):
+    from ui.rounds_manager import download_all_offers
+    columns = [col.strip() for col in args.columns.split(",")] if args.columns else None
+    archive = download_all_offers(progress=_print_progress, fmt=args.format, columns=columns,
+                                  directory=args.output_dir)
+    print(f"All rounds saved as {archive}")
+
+
+def cmd_status(args):
+    from database import db_manager, migrations
+    conn = db_manager.get_connection()
+    candidates = conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+    seats = conn.execute("""
+        SELECT COUNT(*), COALESCE(SUM(set_seats), 0), COALESCE(SUM(seats_booked), 0)
+        FROM seat_matrix
+    """).fetchone()
+    print(f"Database:     {db_manager.DB_NAME} (schema version {migrations.current_version(conn)})")
+    print(f"Candidates:   {candidates}")
+    print(f"Seat matrix:  {seats[0]} categories, {seats[1]} seats, {seats[2]} confirmed")
+
+    offers = dict(conn.execute("SELECT round_no, COUNT(*) FROM offers GROUP BY round_no"))
+    decided = {}
+    for round_no, source, count in conn.execute(
+            "SELECT round_no, source, COUNT(*) FROM decisions GROUP BY round_no, source"):
+        decided.setdefault(round_no, {})[source] = count
+    if not offers:
+        print("Rounds:       none generated")
+    for round_no in sorted(set(offers) | set(decided)):
+        uploaded = ", ".join(f"{source}: {count}" for source, count in sorted(decided.get(round_no, {}).items()))
+        print(f"Round {round_no}:      {offers.get(round_no, 0)} offers; "
+              f"decisions {uploaded or 'not uploaded'}")
+
+
+# ---------- Argument parsing ----------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="mtech_admissions", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--log-level", default=None,
+                        help="DEBUG, INFO, WARNING... (default: $MTECH_LOG_LEVEL or WARNING)")
+    parser.add_argument("--log-file", default=None, help="also write JSON-lines log records to this file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("ingest", help="load an applicant (COAP) workbook into candidates")
+    p.add_argument("file")
+    p.add_argument("--delta", action="store_true",
+                   help="also update candidates whose rows changed (default: only add new ones)")
+    p.set_defaults(func=cmd_ingest)
+
+    p = commands.add_parser("seat-matrix", help="load seat counts (category, set_seats) from a workbook")
+    p.add_argument("file")
+    p.set_defaults(func=cmd_seat_matrix)
+
+    p = commands.add_parser("decisions", help="save the three decision reports of a round")
+    p.add_argument("round", type=int)
+    p.add_argument("--iit-goa", required=True, help="IIT Goa candidate decision report")
+    p.add_argument("--other", required=True, help="accepted at other institute report")
+    p.add_argument("--consolidated", required=True, help="consolidated decision report")
+    p.set_defaults(func=cmd_decisions)
+
+    p = commands.add_parser("run-round", help="allocate seats for a round")
+    p.add_argument("round", type=int)
+    p.set_defaults(func=cmd_run_round)
+
+    p = commands.add_parser("export", help="write a round's offers (RoundN_Offers.xlsx, or CSV / Parquet)")
+    p.add_argument("round", type=int)
+    p.add_argument("--format", choices=("xlsx", "csv", "parquet"), default="xlsx")
+    p.add_argument("--columns", help="comma-separated candidate columns for the detailed sheet (default: all)")
+    p.add_argument("--output-dir", default=".", help="directory to write the files to")
+    p.set_defaults(func=cmd_export)
+
+    p = commands.add_parser("export-all", help="export every round in parallel into All_Rounds_Offers.zip")
+    p.add_argument("--format", choices=("xlsx", "csv", "parquet"), default="xlsx")
+    p.add_argument("--columns", help="comma-separated candidate columns for the detailed sheets (default: all)")
+    p.add_argument("--output-dir", default=".", help="directory to write the archive to")
+    p.set_defaults(func=cmd_export_all)
+
+    p = commands.add_parser("status", help="show candidates, seats and rounds in the database")
+    p.set_defaults(func=cmd_status)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    setup_logging(level=args.log_level or os.environ.get("MTECH_LOG_LEVEL", "WARNING"),
+                  json_path=args.log_file)
+    try:
+        args.func(args)
+    except Exception as e:
+        log.debug("%s failed", args.command, exc_info=True)
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+# tests/test_delta_import.py
+"""Delta re-imports (database/ingest.py) against manual corrections (database/candidate_edits.py)."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import candidate_edits, db_manager, ingest
+
+COLUMNS = ["App_no", "COAP", "Full_Name", "Category", "Gender", "Ews", "Pwd", "MaxGATEScore_3yrs"]
+ROWS = [
+    ("A1", "COAP1", "First Applicant", "GEN", "Male", "No", "No", 612.0),
+    ("A2", "COAP2", "Second Applicant", "OBC", "Female", "No", "No", 587.5),
+    ("A3", "COAP3", "Third Applicant", "SC", "Male", "No", "Yes", 540.0),
+]
+
+
+class DeltaImportTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.db = os.path.join(self.directory, "test.db")
+        ingest.bulk_insert_candidates(COLUMNS, ROWS, db_name=self.db)
+
+    def tearDown(self):
+        db_manager.close_connection(self.db)
+        shutil.rmtree(self.directory)
+
+    def candidate(self, app_no, column):
+        conn = db_manager.get_connection(self.db)
+        return conn.execute(f"SELECT {column} FROM candidates WHERE App_no = ?", (app_no,)).fetchone()[0]
+
+    def edit(self, app_no, changes):
+        version = self.candidate(app_no, candidate_edits.VERSION_COLUMN)
+        candidate_edits.apply_edits({app_no: (version, changes)}, db_name=self.db)
+
+    def test_plain_import_stores_row_hash(self):
+        self.assertEqual(self.candidate("A1", ingest.HASH_COLUMN), ingest.row_hash(COLUMNS, ROWS[0]))
+
+    def test_reimporting_same_export_keeps_manual_edit(self):
+        self.edit("A2", {"Category": "GEN"})
+        summary = ingest.upsert_candidates(COLUMNS, ROWS, db_name=self.db)
+        self.assertEqual(summary, ingest.DeltaSummary(inserted=0, updated=0, unchanged=3, skipped=0))
+        self.assertEqual(self.candidate("A2", "Category"), "GEN")
+
+    def test_changed_row_replaces_manual_edit(self):
+        self.edit("A2", {"Category": "GEN"})
+        rows = [ROWS[0], ROWS[1][:7] + (590.0,), ROWS[2]]
+        summary = ingest.upsert_candidates(COLUMNS, rows, db_name=self.db)
+        self.assertEqual(summary, ingest.DeltaSummary(inserted=0, updated=1, unchanged=2, skipped=0))
+        self.assertEqual(self.candidate("A2", "Category"), "OBC")
+        self.assertEqual(self.candidate("A2", "MaxGATEScore_3yrs"), 590.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
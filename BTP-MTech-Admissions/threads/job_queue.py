@@ -0,0 +1,177 @@
+# threads/job_queue.py
+"""
+Background job framework for slow file / database work.
+
+BackgroundJob is a QThread that runs either a plain function or an
+overridden work() method and reports back through Qt signals, which are
+delivered on the GUI thread.  JobQueue runs submitted jobs in order (one at
+a time by default, since they all write to the same SQLite file), and the
+process-wide instance returned by job_queue() is what widgets submit to.
+
+    job = BackgroundJob("Generate Round 2", run_round, 2)
+    job.completed.connect(self._on_round_generated)
+    job_queue().submit(job)
+
+The function receives the keyword argument progress=job.report, so it can
+publish status text; report() also raises JobCancelled once cancel() has
+been requested, which unwinds the work before anything is committed.
+"""
+from PySide6.QtCore import QObject, QThread, Signal, Slot
+from database import db_manager
+from utils.app_logging import get_logger
+
+log = get_logger("jobs")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's work once cancellation has been requested."""
+
+
+class BackgroundJob(QThread):
+    progress = Signal(str)
+    completed = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, title, fn=None, *args, **kwargs):
+        super().__init__()
+        self.title = title
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.status = "Queued"
+        self.result = None
+        self.error = None
+        self._cancel_requested = False
+
+    # ---------- Work ----------
+    def work(self):
+        """Run the job. Subclasses override this; by default calls fn(*args, progress=..., **kwargs)."""
+        return self.fn(*self.args, progress=self.report, **self.kwargs)
+
+    def run(self):
+        self.status = "Running"
+        try:
+            self.check_cancelled()
+            self.result = self.work()
+        except JobCancelled:
+            self.status = "Cancelled"
+            self.cancelled.emit()
+            return
+        except Exception as e:
+            log.error("%s failed: %s", self.title, e, exc_info=True)
+            self.error = e
+            self.status = "Failed"
+            self.failed.emit(str(e))
+            return
+        finally:
+            # Pooled connections are per thread; this one is about to end
+            db_manager.close_thread_connections()
+        self.status = "Done"
+        self.completed.emit(self.result)
+
+    # ---------- Progress / cancellation (called from the worker thread) ----------
+    def report(self, message):
+        self.check_cancelled()
+        self.status = message
+        self.progress.emit(message)
+
+    def report_rows(self, done, total):
+        """Progress callback with the (done, total) signature used by database.ingest."""
+        if total:
+            self.report(f"{done}/{total} rows processed...")
+        else:
+            self.report(f"{done} rows processed...")
+
+    def cancel(self):
+        self._cancel_requested = True
+        self.requestInterruption()
+
+    def is_cancel_requested(self):
+        return self._cancel_requested
+
+    def check_cancelled(self):
+        if self._cancel_requested:
+            raise JobCancelled()
+
+
+class JobQueue(QObject):
+    """Runs BackgroundJobs in submission order, at most max_concurrent at a time."""
+    jobs_changed = Signal()
+    job_finished = Signal(object)
+
+    def __init__(self, max_concurrent=1, parent=None):
+        super().__init__(parent)
+        self.max_concurrent = max_concurrent
+        self._pending = []
+        self._running = []
+
+    def submit(self, job):
+        job.progress.connect(self._on_job_progress)
+        job.finished.connect(self._on_thread_finished)
+        self._pending.append(job)
+        self._start_next()
+        self.jobs_changed.emit()
+        return job
+
+    def cancel(self, job):
+        if job in self._pending:
+            self._pending.remove(job)
+            job.status = "Cancelled"
+            job.cancelled.emit()
+            self.job_finished.emit(job)
+            # Never started, so finished never fires: release it here
+            job.deleteLater()
+            self.jobs_changed.emit()
+        elif job in self._running:
+            job.cancel()
+            job.status = "Cancelling..."
+            self.jobs_changed.emit()
+
+    def cancel_all(self):
+        for job in list(self._pending) + list(self._running):
+            self.cancel(job)
+
+    def wait_all(self, msecs=5000):
+        for job in list(self._running):
+            job.wait(msecs)
+
+    def running_jobs(self):
+        return list(self._running)
+
+    def pending_jobs(self):
+        return list(self._pending)
+
+    def is_busy(self):
+        return bool(self._running or self._pending)
+
+    def _start_next(self):
+        while self._pending and len(self._running) < self.max_concurrent:
+            job = self._pending.pop(0)
+            self._running.append(job)
+            job.status = "Starting..."
+            job.start()
+
+    @Slot(str)
+    def _on_job_progress(self, _message):
+        self.jobs_changed.emit()
+
+    @Slot()
+    def _on_thread_finished(self):
+        job = self.sender()
+        if job in self._running:
+            self._running.remove(job)
+        self.job_finished.emit(job)
+        job.deleteLater()
+        self._start_next()
+        self.jobs_changed.emit()
+
+
+_queue = None
+
+def job_queue():
+    """The process-wide JobQueue (created on first use, must be called from the GUI thread)."""
+    global _queue
+    if _queue is None:
+        _queue = JobQueue()
+    return _queue
@@ -0,0 +1,71 @@
+# ui/export_dialog.py
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QListWidget, QListWidgetItem,
+    QPushButton, QDialogButtonBox, QMessageBox
+)
+from database import db_manager, offer_export
+from database.db_manager import DB_NAME
+
+
+class ExportOptionsDialog(QDialog):
+    """Pick the export format and the candidate columns of the detailed offers sheet."""
+    def __init__(self, fmt="xlsx", columns=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Export Options")
+        self.resize(360, 480)
+
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(offer_export.FORMATS)
+        self.format_combo.setCurrentText(fmt)
+
+        fmt_row = QHBoxLayout()
+        fmt_row.addWidget(QLabel("Format:"))
+        fmt_row.addWidget(self.format_combo, 1)
+
+        # All columns ticked unless a selection was saved earlier
+        self.column_list = QListWidget()
+        for col in offer_export.detail_columns(db_manager.get_connection(DB_NAME)):
+            item = QListWidgetItem(col)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if columns is None or col in columns else Qt.Unchecked)
+            self.column_list.addItem(item)
+
+        all_btn = QPushButton("Select All")
+        all_btn.clicked.connect(lambda: self._check_all(Qt.Checked))
+        none_btn = QPushButton("Select None")
+        none_btn.clicked.connect(lambda: self._check_all(Qt.Unchecked))
+        check_row = QHBoxLayout()
+        check_row.addWidget(all_btn)
+        check_row.addWidget(none_btn)
+        check_row.addStretch()
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(fmt_row)
+        layout.addWidget(QLabel("Columns in the detailed sheet:"))
+        layout.addWidget(self.column_list)
+        layout.addLayout(check_row)
+        layout.addWidget(buttons)
+
+    def _check_all(self, state):
+        for i in range(self.column_list.count()):
+            self.column_list.item(i).setCheckState(state)
+
+    def selected_format(self):
+        return self.format_combo.currentText()
+
+    def selected_columns(self):
+        """Ticked columns in table order, or None when all are ticked."""
+        items = [self.column_list.item(i) for i in range(self.column_list.count())]
+        checked = [item.text() for item in items if item.checkState() == Qt.Checked]
+        return None if len(checked) == len(items) else checked
+
+    def accept(self):
+        if self.selected_columns() == []:
+            QMessageBox.warning(self, "No Columns", "Select at least one column for the detailed sheet.")
+            return
+        super().accept()
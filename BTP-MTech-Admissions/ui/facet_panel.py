@@ -0,0 +1,103 @@
+# ui/facet_panel.py
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QCheckBox, QSpinBox, QLabel, QPushButton
+)
+from database import facets
+
+
+class FacetPanel(QWidget):
+    """
+    One group of checkboxes per facet in database/facets.py, each labelled
+    with its live count, plus a GATE score range.  Nothing ticked in a group
+    means any value.  Emits changed() whenever a filter changes.
+    """
+    changed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self._boxes = {}    # facet -> {value: QCheckBox}
+        self._groups = {}
+        for name, (title, _, _) in facets.FACETS.items():
+            group = QGroupBox(title)
+            group.setLayout(QVBoxLayout())
+            layout.addWidget(group)
+            self._groups[name] = group
+            self._boxes[name] = {}
+
+        # ---- GATE score range, whole bands only so the counts stay exact ----
+        self.score_min = QSpinBox()
+        self.score_max = QSpinBox()
+        for spin, value in ((self.score_min, 0), (self.score_max, facets.SCORE_MAX)):
+            spin.setRange(0, facets.SCORE_MAX)
+            spin.setSingleStep(facets.SCORE_BAND)
+            spin.setValue(value)
+            spin.setKeyboardTracking(False)
+            spin.valueChanged.connect(self._on_score_changed)
+        score_row = QHBoxLayout()
+        score_row.addWidget(self.score_min)
+        score_row.addWidget(QLabel("to"))
+        score_row.addWidget(self.score_max)
+        score_group = QGroupBox("Max GATE Score")
+        score_group.setLayout(score_row)
+        layout.addWidget(score_group)
+
+        clear_btn = QPushButton("Clear Filters")
+        clear_btn.clicked.connect(self.clear)
+        layout.addWidget(clear_btn)
+        layout.addStretch()
+
+    def filters(self):
+        return {name: {value for value, box in boxes.items() if box.isChecked()}
+                for name, boxes in self._boxes.items()}
+
+    def score_range(self):
+        """(min, max) score, or None when the whole range is selected."""
+        low, high = self.score_min.value(), self.score_max.value()
+        return None if (low, high) == (0, facets.SCORE_MAX) else (low, high)
+
+    def set_counts(self, counts):
+        """Show facets.counts() output; ticked values stay even when their count drops to 0."""
+        for name, rows in counts.items():
+            if name not in self._boxes:
+                continue
+            boxes = self._boxes[name]
+            seen = set()
+            for value, n in rows:
+                seen.add(value)
+                box = boxes.get(value)
+                if box is None:
+                    box = boxes[value] = QCheckBox()
+                    box.toggled.connect(lambda *_: self.changed.emit())
+                    self._groups[name].layout().addWidget(box)
+                box.setText(f"{facets.label(name, value)} ({n})")
+                box.setVisible(True)
+            for value, box in boxes.items():
+                if value not in seen:
+                    box.setText(f"{facets.label(name, value)} (0)")
+                    box.setVisible(box.isChecked())
+
+    def clear(self):
+        self.blockSignals(True)
+        for boxes in self._boxes.values():
+            for box in boxes.values():
+                box.setChecked(False)
+        self.score_min.setValue(0)
+        self.score_max.setValue(facets.SCORE_MAX)
+        self.blockSignals(False)
+        self.changed.emit()
+
+    def _on_score_changed(self):
+        # Snap to whole bands and keep min <= max
+        for spin in (self.score_min, self.score_max):
+            snapped = round(spin.value() / facets.SCORE_BAND) * facets.SCORE_BAND
+            if snapped != spin.value():
+                spin.setValue(snapped)
+                return
+        if self.score_min.value() > self.score_max.value():
+            self.score_max.setValue(self.score_min.value())
+            return
+        self.changed.emit()
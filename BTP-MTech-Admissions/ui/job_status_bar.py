@@ -0,0 +1,71 @@
+# ui/job_status_bar.py
+from PySide6.QtWidgets import QStatusBar, QLabel, QProgressBar, QToolButton, QMenu
+from ui.log_viewer import LogViewer
+
+
+class JobStatusBar(QStatusBar):
+    """Status bar listing running / queued background jobs, with per-job cancel."""
+    def __init__(self, queue, parent=None):
+        super().__init__(parent)
+        self.queue = queue
+
+        self.jobs_label = QLabel("")
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setRange(0, 0)  # indeterminate
+        self.busy_bar.setMaximumWidth(120)
+        self.busy_bar.setTextVisible(False)
+
+        self.cancel_btn = QToolButton()
+        self.cancel_btn.setText("Cancel")
+        self.cancel_btn.setPopupMode(QToolButton.InstantPopup)
+        self.cancel_menu = QMenu(self.cancel_btn)
+        self.cancel_btn.setMenu(self.cancel_menu)
+
+        self.log_btn = QToolButton()
+        self.log_btn.setText("Log")
+        self.log_btn.setToolTip("Show the application log")
+        self.log_btn.clicked.connect(self.show_log)
+        self._log_viewer = None
+
+        self.addPermanentWidget(self.jobs_label, 1)
+        self.addPermanentWidget(self.busy_bar)
+        self.addPermanentWidget(self.cancel_btn)
+        self.addPermanentWidget(self.log_btn)
+
+        queue.jobs_changed.connect(self.refresh)
+        queue.job_finished.connect(self._on_job_finished)
+        self.refresh()
+
+    def refresh(self):
+        running = self.queue.running_jobs()
+        pending = self.queue.pending_jobs()
+
+        parts = [f"{job.title}: {job.status}" for job in running]
+        if pending:
+            parts.append(f"{len(pending)} queued")
+        self.jobs_label.setText("  |  ".join(parts))
+        self.jobs_label.setToolTip("\n".join(
+            [f"Running — {job.title}: {job.status}" for job in running]
+            + [f"Queued — {job.title}" for job in pending]
+        ))
+
+        self.cancel_menu.clear()
+        for job in running + pending:
+            action = self.cancel_menu.addAction(f"Cancel {job.title}")
+            action.triggered.connect(lambda _=False, j=job: self.queue.cancel(j))
+
+        busy = bool(running or pending)
+        self.busy_bar.setVisible(busy)
+        self.cancel_btn.setVisible(busy)
+
+    def show_log(self):
+        if self._log_viewer is None:
+            self._log_viewer = LogViewer(self.window())
+        self._log_viewer.show()
+        self._log_viewer.raise_()
+
+    def _on_job_finished(self, job):
+        if job.status == "Failed":
+            self.showMessage(f"{job.title} failed: {job.error}", 8000)
+        else:
+            self.showMessage(f"{job.title}: {job.status}", 5000)
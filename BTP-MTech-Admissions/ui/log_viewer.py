@@ -0,0 +1,75 @@
+# ui/log_viewer.py
+import logging
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QComboBox, QLabel, QPushButton
+)
+from utils.app_logging import RING_BUFFER_SIZE, ring_buffer
+
+LEVELS = [("Debug", logging.DEBUG), ("Info", logging.INFO), ("Warning", logging.WARNING), ("Error", logging.ERROR)]
+
+
+class LogViewer(QDialog):
+    """Shows the in-memory application log (utils/app_logging.py), polling it while visible."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Application Log")
+        self.resize(900, 450)
+        self._seq = 0
+
+        self.level_combo = QComboBox()
+        for label, level in LEVELS:
+            self.level_combo.addItem(label, level)
+        self.level_combo.setCurrentIndex(1)
+        self.level_combo.currentIndexChanged.connect(self.reload)
+
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.clear)
+
+        top = QHBoxLayout()
+        top.addWidget(QLabel("Level:"))
+        top.addWidget(self.level_combo)
+        top.addStretch()
+        top.addWidget(clear_btn)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(RING_BUFFER_SIZE)
+        self.text.setFont(QFont("Monospace"))
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(top)
+        layout.addWidget(self.text)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.poll)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.reload()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def reload(self):
+        self.text.clear()
+        self._seq = 0
+        self.poll()
+
+    def poll(self):
+        entries = ring_buffer().since(self._seq)
+        if not entries:
+            return
+        self._seq = entries[-1][0]
+        level = self.level_combo.currentData()
+        lines = [text for _, levelno, text in entries if levelno >= level]
+        if lines:
+            self.text.appendPlainText("\n".join(lines))
+
+    def clear(self):
+        ring_buffer().clear()
+        self.text.clear()
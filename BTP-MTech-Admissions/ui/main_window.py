@@ -1,23 +1,31 @@
 # main_window.py
-import sqlite3
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QMessageBox, 
     QTabWidget, QPushButton, QFileDialog, QLabel, QComboBox, QTableWidget, 
     QTableWidgetItem, QScrollArea, QGroupBox, QToolBox, QHBoxLayout
 )
-from ui.update_dialog import UpdateDialog
 # IMPORTANT CHANGE: Import the generic multi-round functions
-from ui.rounds_manager import run_round, download_offers, upload_round_decisions 
-import pandas as pd
-from database import db_manager 
-from ui.round_upload_widget import RoundUploadWidget
-from ui.search_page import SearchPage
-from ui.seat_matrix_upload import SeatMatrixUpload
+from ui.rounds_manager import run_round, download_offers, download_all_offers, upload_round_decisions, RoundWarning
+from database import db_manager, decisions, seat_ledger
+from database.db_manager import DB_NAME
+from threads.excel_worker import ExcelWorker
+from threads.job_queue import BackgroundJob, JobCancelled, job_queue
+from ui.job_status_bar import JobStatusBar
+from utils.app_logging import get_logger
+
+log = get_logger("ui")
+
+# Tabs are built the first time they are shown, so opening the window runs no
+# queries beyond the Initialization tab's; their modules are imported then too.
+TABS = [
+    ("init_tab", "Initialization"),
+    ("seat_matrix_tab", "Seat Matrix"),
+    ("rounds_tab", "Rounds"),
+    ("search_tab", "Search"),
+]
 
 
-DB_NAME = "mtech_offers.db"
-
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -29,23 +37,71 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
-        # Initialization tab
-        self.init_tab = QWidget()
-        self.setup_init_tab()
-        self.tabs.addTab(self.init_tab, "Initialization")
+        # One empty page per tab; _build_tab() fills it on first activation
+        self._pages = {}
+        self._built = {}
+        for name, title in TABS:
+            page = QWidget()
+            QVBoxLayout(page).setContentsMargins(0, 0, 0, 0)
+            self._pages[name] = page
+            self.tabs.addTab(page, title)
+        self._build_tab("init_tab")
+
+        # Seats allocated / booked change as rounds run; show current values
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+
+        # Background jobs (imports, round generation, exports) are listed here
+        self.setStatusBar(JobStatusBar(job_queue(), self))
+
+    # ---------- Lazy tabs ----------
+    def _build_tab(self, name):
+        """Create the widget of tab `name` (once) and return it."""
+        widget = self._built.get(name)
+        if widget is not None:
+            return widget
+        if name == "init_tab":
+            widget = QWidget()
+            self.init_tab = widget
+            self.setup_init_tab()
+        elif name == "seat_matrix_tab":
+            widget = SeatMatrixTab()
+        elif name == "rounds_tab":
+            widget = RoundsWidget(total_rounds=self.total_rounds)
+        elif name == "search_tab":
+            from ui.search_page import SearchPage
+            widget = SearchPage(db_path=DB_NAME)
+            widget.updateRequested.connect(self.open_update_page)
+        self._pages[name].layout().addWidget(widget)
+        self._built[name] = widget
+        log.debug("Built %s tab", name)
+        return widget
+
+    @property
+    def seat_matrix_tab(self):
+        return self._build_tab("seat_matrix_tab")
+
+    @property
+    def rounds_tab(self):
+        return self._build_tab("rounds_tab")
+
+    @property
+    def search_tab(self):
+        return self._build_tab("search_tab")
+
+    def _on_tab_changed(self, index):
+        name = TABS[index][0]
+        if name in self._built:
+            if name == "seat_matrix_tab":
+                self.seat_matrix_tab.load_matrix()
+        else:
+            # A new SeatMatrixTab loads the current values itself
+            self._build_tab(name)
 
-        # Seat matrix tab
-        self.seat_matrix_tab = SeatMatrixTab()
-        self.tabs.addTab(self.seat_matrix_tab, "Seat Matrix")
-        
-        # Rounds tab
-        self.rounds_tab = RoundsWidget(total_rounds=self.total_rounds)
-        self.tabs.addTab(self.rounds_tab, "Rounds")
-        
-        # Search tab
-        self.search_tab = SearchPage(db_path="mtech_offers.db")
-        self.search_tab.updateRequested.connect(self.open_update_page) 
-        self.tabs.addTab(self.search_tab, "Search")
+    def closeEvent(self, event):
+        # Stop background jobs cleanly; their transactions roll back on cancel
+        job_queue().cancel_all()
+        job_queue().wait_all()
+        super().closeEvent(event)
 
     def setup_init_tab(self):
         layout = QVBoxLayout()
@@ -53,15 +109,20 @@ class MainWindow(QMainWindow):
 
         # Upload Excel button
         self.upload_btn = QPushButton("Upload Applicants Excel")
-        self.upload_btn.clicked.connect(self.upload_excel)
+        self.upload_btn.clicked.connect(lambda: self.upload_excel())
         layout.addWidget(self.upload_btn)
 
+        # Re-import a corrected export: new rows are added, changed ones updated
+        self.update_btn = QPushButton("Update Applicants from Excel")
+        self.update_btn.clicked.connect(lambda: self.upload_excel(delta=True))
+        layout.addWidget(self.update_btn)
+
         # Status label
         self.status_label = QLabel("")
         layout.addWidget(self.status_label)
         
     def open_update_page(self, record: dict):
-    # lazy import to avoid circulars
+        from ui.update_dialog import UpdateDialog
         coap = record.get("coap_id")
         if not coap:
             QMessageBox.warning(self, "Missing COAP", "Could not read COAP from the selected row.")
@@ -69,82 +130,40 @@ class MainWindow(QMainWindow):
 
         dlg = UpdateDialog(DB_NAME, coap, self)
         dlg.exec()
+        if dlg.saved:
+            # Names, scores and facet counts in the list may have changed
+            self.search_tab.refresh()
 
-    def upload_excel(self):
+    def upload_excel(self, delta=False):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Select Excel File", "", "Excel Files (*.xlsx *.xls)"
         )
         if not file_path:
             return
 
-        try:
-            # Read Excel
-            df = pd.read_excel(file_path)
-
-            # Remove empty or duplicate columns
-            df = df.loc[:, df.columns.notnull()]
-            df = df.loc[:, ~df.columns.duplicated()]
-
-            # Rename Excel columns to match database exactly
-            column_mapping = {
-                "Si NO": "Si_NO",
-                "App no": "App_no",
-                "Full Name": "Full_Name",
-                "Adm cat": "Adm_cat",
-                "MaxGATEScore out of 3 yrs": "MaxGATEScore_3yrs",
-                "HSSC(date)": "HSSC_date",
-                "HSSC(board)": "HSSC_board",
-                "HSSC(per)": "HSSC_per",
-                "SSC(date)": "SSC_date",
-                "SSC(board)": "SSC_board",
-                "SSC(per)": "SSC_per",
-                "Degree(PassingDate)": "Degree_PassingDate",
-                "Degree(Qualification)": "Degree_Qualification",
-                "Degree(Branch)": "Degree_Branch",
-                "Degree(OtherBranch)": "Degree_OtherBranch",
-                "Degree(Institute Name)": "Degree_Institute",
-                "Degree(CGPA-7thSem)": "Degree_CGPA_7th",
-                "Degree(CGPA-8thSem)": "Degree_CGPA_8th",
-                "Degree(Per-7thSem)": "Degree_Per_7th",
-                "Degree(Per-8thSem)": "Degree_Per_8th",
-                "GATE Roll num": "GATE_Roll_num",
-                "unnamed": "ExtraColumn"
-            }
-            df.rename(columns={k: v for k, v in column_mapping.items() if k in df.columns}, inplace=True)
-
-            # Convert datetime columns to string
-            for col in ['HSSC_date', 'SSC_date', 'Degree_PassingDate']:
-                if col in df.columns:
-                    df[col] = df[col].apply(
-                        lambda x: x.strftime('%Y-%m-%d') if pd.notnull(x) and not isinstance(x, str) else x
-                    )
-
-            # Connect to DB
-            conn = db_manager.get_connection()
-            cursor = conn.cursor()
-
-            # Get list of columns in DB
-            cursor.execute("PRAGMA table_info(candidates)")
-            table_columns = [info[1] for info in cursor.fetchall()]
-
-            # Only keep columns that exist in DB
-            insert_columns = [c for c in df.columns if c in table_columns]
-            placeholders = ', '.join(['?'] * len(insert_columns))
-
-            # Insert rows
-            for _, row in df.iterrows():
-                values = [row[c] for c in insert_columns]
-                cursor.execute(
-                    f'INSERT OR IGNORE INTO candidates ({", ".join(insert_columns)}) VALUES ({placeholders})',
-                    values
-                )
-
-            conn.commit()
-            conn.close()
-            self.status_label.setText("Excel data inserted successfully into database!")
-
-        except Exception as e:
-            self.status_label.setText(f"Error: {str(e)}")
+        self._set_upload_enabled(False)
+        worker = ExcelWorker(file_path, delta=delta)
+        worker.progress.connect(self.status_label.setText)
+        worker.completed.connect(self._on_upload_finished)
+        worker.failed.connect(self._on_upload_failed)
+        worker.cancelled.connect(self._on_upload_cancelled)
+        job_queue().submit(worker)
+
+    def _set_upload_enabled(self, enabled):
+        self.upload_btn.setEnabled(enabled)
+        self.update_btn.setEnabled(enabled)
+
+    def _on_upload_finished(self, message):
+        self.status_label.setText(message)
+        self._set_upload_enabled(True)
+
+    def _on_upload_failed(self, error):
+        self.status_label.setText(f"Error: {error}")
+        self._set_upload_enabled(True)
+
+    def _on_upload_cancelled(self):
+        self.status_label.setText("Upload cancelled — no rows were changed.")
+        self._set_upload_enabled(True)
     
     # NOTE: setup_rounds_tab is no longer needed as RoundsWidget handles its own setup
 
@@ -159,13 +178,13 @@ class SeatMatrixTab(QWidget):
         layout = QVBoxLayout(self)
 
         # top: Upload widget (uses your existing seat_matrix_upload module)
+        from ui.seat_matrix_upload import SeatMatrixUpload
         self.upload_widget = SeatMatrixUpload()
         layout.addWidget(self.upload_widget)
 
-        # Connect the upload button so that after upload completes we reload the UI.
-        # Note: SeatMatrixUpload.upload_excel does the DB writing and sets a status label.
-        # We call load_matrix() afterwards to refresh the visible tables.
-        self.upload_widget.upload_btn.clicked.connect(self._on_upload_clicked)
+        # SeatMatrixUpload writes the DB in a background job and emits `uploaded`
+        # when it is done; reload the visible tables then.
+        self.upload_widget.uploaded.connect(self.load_matrix)
 
         # Separator / info
         info = QLabel("Or edit seat counts below and click Save Seat Matrix")
@@ -197,21 +216,6 @@ class SeatMatrixTab(QWidget):
         # Load initial state from DB
         self.load_matrix()
 
-    def _on_upload_clicked(self):
-        """Wrapper called when the Upload button is clicked.
-        It calls the upload widget's upload flow and then reloads the seat matrix from DB.
-        """
-        try:
-            # trigger the upload flow (this opens the file dialog inside SeatMatrixUpload)
-            self.upload_widget.upload_excel()
-        except Exception as e:
-            # keep UX friendly: show a message but continue to attempt reload
-            from PySide6.QtWidgets import QMessageBox
-            QMessageBox.critical(self, "Upload Error", f"Upload failed: {e}")
-
-        # Reload whatever is in DB now (works whether upload succeeded or not)
-        self.load_matrix()
-
     def create_sections(self):
         """Create collapsible sections (QToolBox) for each main category."""
         for section, subcats in self.categories.items():
@@ -236,15 +240,12 @@ class SeatMatrixTab(QWidget):
 
     def load_matrix(self):
         """Load data from seat_matrix table into GUI."""
-        conn = db_manager.get_connection()
-        cursor = conn.cursor()
         try:
-            cursor.execute("SELECT category, set_seats, seats_allocated, seats_booked FROM seat_matrix")
+            cursor = db_manager.get_connection().execute(
+                "SELECT category, set_seats, seats_allocated, seats_booked FROM seat_matrix")
             data = cursor.fetchall()
         except Exception:
             data = []
-        finally:
-            conn.close()
 
         # fill GUI with DB values
         for category, set_seats, seats_allocated, seats_booked in data:
@@ -259,8 +260,7 @@ class SeatMatrixTab(QWidget):
 
     def save_matrix(self):
         """Save data back to the database."""
-        conn = db_manager.get_connection()
-        cursor = conn.cursor()
+        rows = []
         for section, table in self.tables.items():
             for r in range(table.rowCount()):
                 category = table.verticalHeaderItem(r).text()
@@ -269,34 +269,74 @@ class SeatMatrixTab(QWidget):
                     set_seats = int(table.item(r, 0).text())
                 except Exception:
                     set_seats = 0
-                try:
-                    seats_allocated = int(table.item(r, 1).text())
-                except Exception:
-                    seats_allocated = 0
-                try:
-                    seats_booked = int(table.item(r, 2).text())
-                except Exception:
-                    seats_booked = 0
-
-                cursor.execute("""
-                    INSERT OR REPLACE INTO seat_matrix (category, set_seats, seats_allocated, seats_booked)
-                    VALUES (?, ?, ?, ?)
-                """, (category, set_seats, seats_allocated, seats_booked))
-        conn.commit()
-        conn.close()
-        
+
+                rows.append((category, set_seats))
+
+        # Allocated / booked columns are maintained from the rounds (read-only here)
+        self.save_btn.setEnabled(False)
+        job = BackgroundJob("Save seat matrix", _save_set_seats, rows)
+        job.completed.connect(self._on_saved)
+        job.failed.connect(self._on_save_failed)
+        job.cancelled.connect(lambda: self.save_btn.setEnabled(True))
+        job_queue().submit(job)
+
+    def _on_saved(self, _result):
+        self.save_btn.setEnabled(True)
+        self.load_matrix()
+
         msg = QMessageBox()
         msg.setIcon(QMessageBox.Information)
         msg.setWindowTitle("Saved Successfully")
         msg.setText("Seat Matrix data has been saved to the database successfully!")
         msg.exec()
 
+    def _on_save_failed(self, error):
+        self.save_btn.setEnabled(True)
+        QMessageBox.critical(self, "DB Error", f"Failed to save the seat matrix:\n{error}")
+
+def _save_set_seats(rows, progress=None):
+    """Background job body: write the Set Seats column of the seat matrix."""
+    if progress:
+        progress("Saving seat matrix...")
+    with db_manager.transaction() as conn:
+        seat_ledger.save_set_seats(conn, rows)
+
 # ----------------------------------------------------------------------
 # RoundsWidget (UPDATED LOGIC)
 # ---------------------------------------------------------------------
+def _clear_round_decisions(round_no, sources, progress=None):
+    """Background job body: delete the saved decisions of round_no from each source, all or nothing."""
+    with db_manager.transaction(DB_NAME) as conn:
+        for source in sources:
+            if progress:
+                progress(f"Clearing Round {round_no} {source} decisions...")
+            decisions.clear_round(conn, round_no, source)
+    return round_no
+
+
+def _generate_round(round_no, file_paths=None, progress=None):
+    """Background job body: save Round N-1 decisions (if any), then allocate Round N."""
+    if file_paths:
+        try:
+            # Upload the decisions of the PREVIOUS round (round_no - 1)
+            upload_round_decisions(
+                round_no=round_no - 1,
+                iit_goa_report=file_paths[0],
+                other_iit_report=file_paths[1],
+                consolidated_report=file_paths[2],
+                progress=progress
+            )
+        except JobCancelled:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to upload decisions for Round {round_no - 1}: {e}") from e
+
+    return round_no, run_round(round_no, progress=progress)
+
 class RoundsWidget(QWidget):
     def __init__(self, total_rounds=10):
         super().__init__()
+        from ui.round_upload_widget import RoundUploadWidget
         self.total_rounds = total_rounds
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
@@ -314,11 +354,10 @@ class RoundsWidget(QWidget):
             ("Mtech App No", "Mtech App No"), 
             ("Applicant Decision", "Applicant Decision")
         ]
-        table_name_fn_1 = lambda round_no: f"iit_goa_offers_round{round_no}"
         self.upload1 = RoundUploadWidget(
             title="1. IIT Goa Offered Candidate Decision File",
             required_map=required_map_1,
-            table_name_fn=table_name_fn_1
+            source=decisions.IIT_GOA
         )
         self.layout.addWidget(self.upload1)
 
@@ -327,11 +366,10 @@ class RoundsWidget(QWidget):
             ("Mtech App No", "Mtech App No"),
             ("Other Institute Decision", "Other Institute Decision")
         ]
-        table_name_fn_2 = lambda round_no: f"accepted_other_institute_round{round_no}"
         self.upload2 = RoundUploadWidget(
             title="2. IIT Goa Offered But Accepted at Different Institute File",
             required_map=required_map_2,
-            table_name_fn=table_name_fn_2
+            source=decisions.OTHER_INSTITUTE
         )
         self.layout.addWidget(self.upload2)
 
@@ -340,11 +378,10 @@ class RoundsWidget(QWidget):
             ("COAP Reg Id", "COAP Reg Id"),
             ("Applicant Decision", "Applicant Decision")
         ]
-        table_name_fn_3 = lambda round_no: f"consolidated_decisions_round{round_no}"
         self.upload3 = RoundUploadWidget(
             title="3. Consolidated Decision File",
             required_map=required_map_3,
-            table_name_fn=table_name_fn_3
+            source=decisions.CONSOLIDATED
         )
         self.layout.addWidget(self.upload3)
 
@@ -358,6 +395,21 @@ class RoundsWidget(QWidget):
         self.download_btn.clicked.connect(self.download_current_round_offers)
         btn_layout.addWidget(self.download_btn)
 
+        self.browse_offers_btn = QPushButton("Browse Offers")
+        self.browse_offers_btn.clicked.connect(self.browse_offers)
+        btn_layout.addWidget(self.browse_offers_btn)
+
+        self.download_all_btn = QPushButton("Export All Rounds")
+        self.download_all_btn.clicked.connect(self.download_all_rounds)
+        btn_layout.addWidget(self.download_all_btn)
+
+        # Format and detailed-sheet columns used by Download Offers / Export All Rounds
+        self.export_format = "xlsx"
+        self.export_columns = None  # None = every candidate column
+        self.export_options_btn = QPushButton("Export Options...")
+        self.export_options_btn.clicked.connect(self.choose_export_options)
+        btn_layout.addWidget(self.export_options_btn)
+
         self.reset_btn = QPushButton("Reset Uploaded Files")
         self.reset_btn.clicked.connect(self.reset_round)
         btn_layout.addWidget(self.reset_btn)
@@ -381,16 +433,9 @@ class RoundsWidget(QWidget):
     def refresh_rounds(self):
         """Populate dropdown based on already generated rounds."""
         self.round_combo.clear()
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='offers'")
-        if cursor.fetchone() is None:
-            max_round = 0
-        else:
-            cursor.execute("SELECT MAX(round_no) FROM offers")
-            max_round = cursor.fetchone()[0] or 0
-        conn.close()
+        cursor = db_manager.get_connection(DB_NAME).cursor()
+        cursor.execute("SELECT MAX(round_no) FROM offers")
+        max_round = cursor.fetchone()[0] or 0
 
         start_round = 1
         end_round = (max_round + 1) if max_round else 1
@@ -458,57 +503,120 @@ class RoundsWidget(QWidget):
             if not all(file_paths):
                 QMessageBox.critical(self, "Missing Files", f"Please upload the three decision files for **Round {round_no - 1}** before running Round {round_no}.")
                 return
-            
-            try:
-                # Upload the decisions of the PREVIOUS round (round_no - 1)
-                upload_round_decisions(
-                    round_no=prev_round,
-                    iit_goa_report=file_paths[0],
-                    other_iit_report=file_paths[1],
-                    consolidated_report=file_paths[2]
-                )
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Upload Error", f"Failed to upload decisions for Round {round_no - 1}:\n{e}")
-                return
-                
-        # 2. Run Allocation
-        run_round(round_no) 
-
+        else:
+            file_paths = None
+
+        # 2. Upload decisions + run allocation in the background
+        self.generate_btn.setEnabled(False)
+        job = BackgroundJob(f"Generate Round {round_no}", _generate_round, round_no, file_paths)
+        job.completed.connect(self._on_round_generated)
+        job.failed.connect(self._on_round_failed)
+        job.cancelled.connect(self._on_round_cancelled)
+        job_queue().submit(job)
+
+    def _on_round_generated(self, result):
+        round_no, offer_count = result
+        QMessageBox.information(self, "Success", f"Round {round_no} allocation complete!\nTotal offers: {offer_count}")
         # 3. Finalize
         self.refresh_rounds() # Refresh to show the next round option
         self.update_ui_visibility() # Update button state
 
+    def _on_round_failed(self, error):
+        job = self.sender()
+        if isinstance(job.error, RoundWarning):
+            QMessageBox.warning(self, "Round Complete", error)
+        else:
+            QMessageBox.critical(self, "Error", f"Error during {job.title}:\n{error}")
+        self.update_ui_visibility()
+
+    def _on_round_cancelled(self):
+        self.update_ui_visibility()
+
     def download_current_round_offers(self):
         """Download offers for the current round."""
         round_no = self.get_current_round()
-        download_offers(round_no)
+        self.download_btn.setEnabled(False)
+        job = BackgroundJob(f"Export Round {round_no} offers", download_offers, round_no,
+                            fmt=self.export_format, columns=self.export_columns)
+        job.completed.connect(self._on_download_finished)
+        job.failed.connect(self._on_download_failed)
+        job.cancelled.connect(self._on_download_cancelled)
+        job_queue().submit(job)
+
+    def _on_download_cancelled(self):
+        self.download_btn.setEnabled(True)
+
+    def download_all_rounds(self):
+        """Export every generated round into one zip archive."""
+        self.download_all_btn.setEnabled(False)
+        job = BackgroundJob("Export all rounds", download_all_offers,
+                            fmt=self.export_format, columns=self.export_columns)
+        job.completed.connect(self._on_download_all_finished)
+        job.failed.connect(self._on_download_all_failed)
+        job.cancelled.connect(lambda: self.download_all_btn.setEnabled(True))
+        job_queue().submit(job)
+
+    def _on_download_all_finished(self, archive):
+        self.download_all_btn.setEnabled(True)
+        QMessageBox.information(self, "Export Complete", f"All rounds saved as {archive}")
+
+    def _on_download_all_failed(self, error):
+        self.download_all_btn.setEnabled(True)
+        if isinstance(self.sender().error, RoundWarning):
+            QMessageBox.warning(self, "No Offers", error)
+        else:
+            QMessageBox.critical(self, "Error", f"Export failed:\n{error}")
+
+    def browse_offers(self):
+        from ui.offers_browser import OffersBrowser
+        OffersBrowser(self.get_current_round(), DB_NAME, self).exec()
+
+    def choose_export_options(self):
+        from ui.export_dialog import ExportOptionsDialog
+        dlg = ExportOptionsDialog(self.export_format, self.export_columns, self)
+        if dlg.exec():
+            self.export_format = dlg.selected_format()
+            self.export_columns = dlg.selected_columns()
+
+    def _on_download_finished(self, filenames):
+        self.download_btn.setEnabled(True)
+        QMessageBox.information(self, "Download Complete", f"Offers saved as {', '.join(filenames)}")
+
+    def _on_download_failed(self, error):
+        self.download_btn.setEnabled(True)
+        if isinstance(self.sender().error, RoundWarning):
+            QMessageBox.warning(self, "No Offers", error)
+        else:
+            QMessageBox.critical(self, "Error", f"Export failed:\n{error}")
 
     def reset_round(self):
-        """Reset uploaded files and their DB tables for current round."""
+        """Reset uploaded files and their saved decisions for the previous round."""
         round_no = self.get_current_round()
         if round_no == 1:
             QMessageBox.warning(self, "Warning", "Cannot reset Round 1 uploads. It does not require decision files.")
             return
 
         if QMessageBox.question(self, "Confirm Reset", 
-                                f"Are you sure you want to delete the uploaded decision files and corresponding database tables for **Round {round_no - 1}**?", 
+                                f"Are you sure you want to delete the uploaded decision files and saved decisions for **Round {round_no - 1}**?", 
                                 QMessageBox.Yes | QMessageBox.No) == QMessageBox.No:
             return
 
         # We reset the files and tables for the PREVIOUS round (N-1)
         prev_round = round_no - 1
+        sources = [upload.source for upload in [self.upload1, self.upload2, self.upload3]]
+        self.reset_btn.setEnabled(False)
+        job = BackgroundJob(f"Reset Round {prev_round} decisions", _clear_round_decisions, prev_round, sources)
+        job.completed.connect(self._on_round_reset)
+        job.failed.connect(self._on_round_reset_failed)
+        job.cancelled.connect(lambda: self.reset_btn.setEnabled(True))
+        job_queue().submit(job)
+
+    def _on_round_reset(self, prev_round):
+        self.reset_btn.setEnabled(True)
         for upload in [self.upload1, self.upload2, self.upload3]:
-            table_name = upload.table_name_fn(prev_round)
-            conn = sqlite3.connect(DB_NAME)
-            cursor = conn.cursor()
-            try:
-                cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
-                conn.commit()
-                upload.reset_widget()
-            except Exception as e:
-                QMessageBox.critical(self, "DB Error", f"Failed to drop table {table_name}: {e}")
-            finally:
-                conn.close()
-        
-        QMessageBox.information(self, "Reset Complete", f"Decision uploads and tables for Round {prev_round} cleared!")
\ No newline at end of file
+            upload.reset_widget()
+        QMessageBox.information(self, "Reset Complete", f"Decision uploads for Round {prev_round} cleared!")
+
+    def _on_round_reset_failed(self, error):
+        self.reset_btn.setEnabled(True)
+        QMessageBox.critical(self, "DB Error", f"Failed to clear the saved decisions:\n{error}")
\ No newline at end of file
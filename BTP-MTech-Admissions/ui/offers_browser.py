@@ -0,0 +1,47 @@
+# ui/offers_browser.py
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox
+from database import browse, db_manager
+from database.db_manager import DB_NAME
+from ui.sql_table_model import SqlTableModel, SqlTableView
+
+
+class OffersBrowser(QDialog):
+    """All offers made so far, or one round's, paged in from the offers table."""
+    def __init__(self, round_no=None, db_path=DB_NAME, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Offers")
+        self.resize(900, 560)
+
+        self.round_combo = QComboBox()
+        self.round_combo.addItem("All Rounds", None)
+        rounds = db_manager.get_connection(db_path).execute(
+            "SELECT DISTINCT round_no FROM offers ORDER BY round_no").fetchall()
+        for (r,) in rounds:
+            self.round_combo.addItem(f"Round {r}", r)
+        if round_no is not None and self.round_combo.findData(round_no) >= 0:
+            self.round_combo.setCurrentIndex(self.round_combo.findData(round_no))
+        self.round_combo.currentIndexChanged.connect(self.reload)
+
+        self.count_label = QLabel("")
+
+        top = QHBoxLayout()
+        top.addWidget(QLabel("Show:"))
+        top.addWidget(self.round_combo)
+        top.addStretch()
+        top.addWidget(self.count_label)
+
+        self.model = SqlTableModel(db_path, browse.OFFERS, parent=self)
+        self.table = SqlTableView(self.model, sort_column=0, parent=self)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(top)
+        layout.addWidget(self.table)
+        self.reload()
+
+    def reload(self):
+        round_no = self.round_combo.currentData()
+        if round_no is None:
+            self.model.browse()
+        else:
+            self.model.browse("o.round_no = ?", (round_no,))
+        self.count_label.setText(f"{self.model.total_rows()} offers")
@@ -1,28 +1,56 @@
 import os
-import sqlite3
-import pandas as pd
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QFileDialog, QComboBox, QTableWidget, QTableWidgetItem, QMessageBox
 )
+from database import db_manager, decisions
+from database.db_manager import DB_NAME
+from database.excel_stream import read_header_preview
+from threads.job_queue import BackgroundJob, job_queue
 
-DB_NAME = "mtech_offers.db"
 
-def _sanitize_col_name(name: str) -> str:
-    """Sanitize SQL column names (letters, numbers, underscore only)."""
-    return "".join(c if c.isalnum() or c == "_" else "_" for c in str(name)).lower()
+# Rows shown under the column mapping so the user can check the picked columns
+PREVIEW_ROWS = 5
+
+
+def _save_decision_file(path, col_map, required_map, source, round_no, progress=None):
+    """
+    Background job body: fully parse the selected columns of `path` and save
+    them as the `source` decisions of round_no.  The first entry of
+    required_map is the key column, the second the decision column.
+    """
+    import pandas as pd
+
+    if progress:
+        progress(f"Reading {os.path.basename(path)}...")
+    key_col = col_map.get(required_map[0][0])
+    decision_col = col_map.get(required_map[1][0])
+    df = pd.read_excel(path, usecols=sorted({key_col, decision_col}))
+    if key_col not in df.columns or decision_col not in df.columns:
+        raise ValueError("Selected columns could not be found or mapped correctly.")
+
+    if progress:
+        progress(f"Saving {len(df)} Round {round_no} decisions...")
+    with db_manager.transaction(DB_NAME) as conn:
+        count = decisions.save_decisions(
+            conn, round_no, source, zip(df[key_col].tolist(), df[decision_col].tolist())
+        )
+    return f"{count} Round {round_no} decisions saved ({decisions.legacy_name(source, round_no)})"
 
 
 class SingleFileUpload(QWidget):
     """Handles single Excel file upload, column mapping, and DB save."""
-    def __init__(self, title, required_map, table_name_fn):
+    def __init__(self, title, required_map, source):
         super().__init__()
         self.title = title
-        self.required_map = required_map  # list of tuples (db_col, human_label)
-        self.table_name_fn = table_name_fn
+        self.required_map = required_map  # list of tuples (db_col, human_label): key first, then decision
+        self.source = source  # decisions.IIT_GOA / OTHER_INSTITUTE / CONSOLIDATED
 
         self.file_path = None
-        self.df = None
+        # Only the header and a few rows are read on selection; the full
+        # parse happens in the background when the file is saved.
+        self.columns = []
+        self.preview_rows = []
         self.col_map = {}
 
         self.layout = QVBoxLayout()
@@ -48,22 +76,38 @@ class SingleFileUpload(QWidget):
 
         self.layout.addLayout(row)
         self.table_widget = None
+        self.preview_widget = None
 
     def select_file(self):
         path, _ = QFileDialog.getOpenFileName(self, "Select Excel File", "", "Excel Files (*.xlsx *.xls)")
         if not path:
             return
+        try:
+            columns, preview_rows = read_header_preview(path, PREVIEW_ROWS)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not read file:\n{e}")
+            return
+        if not columns:
+            QMessageBox.warning(self, "Empty File", "The selected file has no header row.")
+            return
+
         self.file_path = path
-        self.df = pd.read_excel(self.file_path)
+        self.columns = columns
+        self.preview_rows = preview_rows
         self.title_label.setText(f"{self.title}: <font color='green'>{os.path.basename(path)}</font>")
         self.get_cols_btn.setEnabled(True)
 
+    def clear_tables(self):
+        for attr in ("table_widget", "preview_widget"):
+            widget = getattr(self, attr)
+            if widget:
+                self.layout.removeWidget(widget)
+                widget.deleteLater()
+                setattr(self, attr, None)
+
     def show_column_match_table(self):
-        if self.table_widget:
-            self.layout.removeWidget(self.table_widget)
-            self.table_widget.deleteLater()
-            self.table_widget = None
-            self.col_map = {}
+        self.clear_tables()
+        self.col_map = {}
 
         self.table_widget = QTableWidget()
         self.table_widget.setColumnCount(2)
@@ -74,23 +118,32 @@ class SingleFileUpload(QWidget):
         for i, (db_col, human_label) in enumerate(self.required_map):
             self.table_widget.setItem(i, 0, QTableWidgetItem(human_label))
             combo = QComboBox()
-            combo.addItems(self.df.columns.tolist())
+            combo.addItems(self.columns)
             combo.currentTextChanged.connect(lambda val, i=i, db=db_col: self.set_col_map(db, val))
             self.table_widget.setCellWidget(i, 1, combo)
             # preselect first column
-            self.set_col_map(db_col, self.df.columns[0])
+            self.set_col_map(db_col, self.columns[0])
 
         self.layout.addWidget(self.table_widget)
+
+        # First rows of the file, to sanity-check the mapping
+        self.preview_widget = QTableWidget(len(self.preview_rows), len(self.columns))
+        self.preview_widget.setHorizontalHeaderLabels(self.columns)
+        for r, values in enumerate(self.preview_rows):
+            for c, v in enumerate(values):
+                self.preview_widget.setItem(r, c, QTableWidgetItem("" if v is None else str(v)))
+        self.preview_widget.setMaximumHeight(160)
+        self.layout.addWidget(self.preview_widget)
+
         self.save_btn.setEnabled(True)
 
     def set_col_map(self, db_col, val):
         self.col_map[db_col] = val
 
     def save_to_db(self, round_no=None):
-        if round_no is None:
+        if round_no is None or isinstance(round_no, bool):
             # Attempt to fetch the selected round number from the parent widget (RoundsWidget)
             # We use an integer fallback (1) instead of allowing boolean/None
-            current_round_text = None
             parent_widget = self.parent() 
             while parent_widget is not None and not hasattr(parent_widget, "get_current_round"):
                 parent_widget = parent_widget.parent()
@@ -107,69 +160,42 @@ class SingleFileUpload(QWidget):
                 # Default to Round 1 if the parent structure cannot be found
                 round_no = 1
         
-        # Ensure round_no is an integer (required by self.table_name_fn)
+        # Ensure round_no is an integer
         if not isinstance(round_no, int) or round_no < 1:
             QMessageBox.critical(self, "Error", "Invalid round number determined for saving.")
             return
 
-        # Build table name with correct round number
-        table_name = self.table_name_fn(round_no)
-        print(f"[DEBUG] Saving data to table: {table_name}")
+        self.save_btn.setEnabled(False)
+        job = BackgroundJob(f"Save {os.path.basename(self.file_path)}", _save_decision_file,
+                            self.file_path, dict(self.col_map), self.required_map, self.source, round_no)
+        job.completed.connect(self._on_saved)
+        job.failed.connect(self._on_save_failed)
+        job.cancelled.connect(self._on_save_cancelled)
+        job_queue().submit(job)
+
+    def _on_saved(self, message):
+        self.save_btn.setEnabled(True)
+        QMessageBox.information(self, "Saved", message)
 
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
+    def _on_save_failed(self, error):
+        self.save_btn.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Failed to save data to DB:\n{error}")
+
+    def _on_save_cancelled(self):
+        self.save_btn.setEnabled(True)
 
-        # Determine the primary key column name based on the table name
-        pk_col = "mtech_app_no" if "goa" in table_name or "other_institute" in table_name else "coap_reg_id"
 
-        # Map selected Excel column names to the expected standard DB column names
-        # We only keep the required columns and rename them to the standard snake_case
-        required_db_cols = [db_col for db_col, _ in self.required_map]
-        
-        # This new mapping ensures that the data saved locally matches what rounds_manager.py expects, 
-        # even if it's currently redundant due to the main round logic using file paths.
-        renamed_df = pd.DataFrame()
-        for db_col, excel_col in self.col_map.items():
-            renamed_db_col_name = {
-                "Mtech App No": "mtech_app_no",
-                "Other Institute Decision": "other_institute_decision",
-                "COAP Reg Id": "coap_reg_id",
-                "Applicant Decision": "applicant_decision"
-            }.get(db_col, db_col) # Use a standardized mapping
-
-            if excel_col in self.df.columns:
-                 renamed_df[renamed_db_col_name] = self.df[excel_col]
-
-        # Save to DB using pandas, replacing the manual cursor execution
-        # Ensure only the necessary columns exist
-        if renamed_df.empty:
-            QMessageBox.critical(self, "Error", "Selected columns could not be found or mapped correctly.")
-            conn.close()
-            return
-            
-        try:
-            # Drop and recreate table with correct structure using pandas and Primary Key
-            # NOTE: Pandas' to_sql doesn't directly support adding PRIMARY KEY easily without raw SQL.
-            # However, since rounds_manager._create_decision_tables is called separately, we rely on that for schema.
-            # We simply use replace here for simplicity.
-            renamed_df.to_sql(table_name, conn, if_exists='replace', index=False)
-            conn.commit()
-            QMessageBox.information(self, "Saved", f"File saved to table {table_name}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save data to DB table {table_name}:\n{e}")
-        finally:
-            conn.close()
 class RoundUploadWidget(QWidget):
     """Wrapper to hold a SingleFileUpload and provide save/reset."""
-    def __init__(self, title=None, required_map=None, table_name_fn=None):
+    def __init__(self, title=None, required_map=None, source=None):
         super().__init__()
         self.title = title
         self.required_map = required_map
-        self.table_name_fn = table_name_fn
+        self.source = source
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
 
-        self.upload_widget = SingleFileUpload(title, required_map, table_name_fn)
+        self.upload_widget = SingleFileUpload(title, required_map, source)
         self.layout.addWidget(self.upload_widget)
     def get_file_path(self):
         if self.upload_widget:
@@ -184,12 +210,10 @@ class RoundUploadWidget(QWidget):
         if not self.upload_widget:
             return
         self.upload_widget.file_path = None
-        self.upload_widget.df = None
+        self.upload_widget.columns = []
+        self.upload_widget.preview_rows = []
         self.upload_widget.col_map = {}
         self.upload_widget.title_label.setText(f"{self.upload_widget.title}: <font color='red'>No file uploaded</font>")
         self.upload_widget.get_cols_btn.setEnabled(False)
         self.upload_widget.save_btn.setEnabled(False)
-        if self.upload_widget.table_widget:
-            self.upload_widget.layout.removeWidget(self.upload_widget.table_widget)
-            self.upload_widget.table_widget.deleteLater()
-            self.upload_widget.table_widget = None
+        self.upload_widget.clear_tables()
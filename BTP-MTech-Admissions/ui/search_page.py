@@ -193,17 +193,24 @@ import sqlite3
 from pathlib import Path
 from typing import Optional
 
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QBrush, QColor
-from PySide6.QtWidgets import (
-    QWidget, QLabel, QLineEdit, QComboBox, QPushButton, QHBoxLayout, QVBoxLayout,
-    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QToolButton
-)
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtWidgets import QWidget, QLabel, QLineEdit, QHBoxLayout, QVBoxLayout, QScrollArea
+from database import browse, candidate_search, db_manager, facets, record_cache
+from ui.facet_panel import FacetPanel
+from ui.sql_table_model import SqlTableModel, SqlTableView
+
+# Pause after the last keystroke before searching
+DEBOUNCE_MS = 200
+
 
 class SearchPage(QWidget):
     """
-    Search by COAP + Category + Gender (exact).
-    Shows: COAP | App_no | Category | Gender | MaxGATEScore_3yrs | Pwd | Ews
+    Search-as-you-type over name, email, COAP, application and GATE roll
+    numbers (database/candidate_search.py), narrowed by the facet filters on
+    the left (database/facets.py), whose counts follow the other filters.
+    With an empty search box every matching candidate is listed, fetched a
+    page at a time as the table scrolls and sortable by the indexed columns.
+    Shows: COAP | Name | App_no | Category | Gender | MaxGATEScore_3yrs | Pwd | Ews
     Emits updateRequested(dict) when UPDATE is clicked (dict contains coap/category/gender/app_no etc.)
     """
     updateRequested = Signal(dict)
@@ -214,160 +221,99 @@ class SearchPage(QWidget):
         self.db_path = Path(db_path) if db_path else Path.cwd() / "mtech_offers.db"
 
         # ---- Filters ----
-        self.coap_input = QLineEdit()
-        self.coap_input.setPlaceholderText("COAP ID")
-        self.coap_input.setClearButtonEnabled(True)
-        self.coap_input.setMinimumWidth(200)
-
-        self.category_combo = QComboBox()
-        self.category_combo.addItems(["Category", "GEN", "OBC", "SC", "ST"])
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Name, email, COAP, application or GATE roll number")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setMinimumWidth(320)
 
-        self.gender_combo = QComboBox()
-        self.gender_combo.addItems(["Gender", "Male", "Female"])
-
-        self.find_btn = QPushButton("🔍  FIND DETAILS")
-        self.find_btn.setDefault(True)
-        self.find_btn.clicked.connect(self._on_find_clicked)
+        self.count_label = QLabel("")
 
         top = QHBoxLayout()
-        top.addWidget(self.coap_input, 2)
-        top.addWidget(self.category_combo, 1)
-        top.addWidget(self.gender_combo, 1)
-        top.addWidget(self.find_btn, 0, Qt.AlignLeft)
+        top.addWidget(self.search_input, 3)
         top.addStretch(1)
-
-        # ---- Results table ----
-        self.table = QTableWidget(0, 8, self)
-        self.table.setHorizontalHeaderLabels([
-            "COAP ID", "Application Number", "Category", "Gender",
-            "Max Gate Score", "PWD", "EWS", "Action"
-        ])
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.horizontalHeader().setHighlightSections(False)
-        self.table.verticalHeader().setVisible(False)
-        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.table.setAlternatingRowColors(True)
-        self.table.setShowGrid(True)
+        top.addWidget(self.count_label)
+
+        self.facet_panel = FacetPanel()
+        facet_scroll = QScrollArea()
+        facet_scroll.setWidget(self.facet_panel)
+        facet_scroll.setWidgetResizable(True)
+        facet_scroll.setFixedWidth(220)
+
+        # ---- Results table (browse order: merit) ----
+        self.model = SqlTableModel(self.db_path, browse.CANDIDATES, action="UPDATE", parent=self)
+        score_column = browse.keys(browse.CANDIDATES).index("max_gate_score")
+        self.table = SqlTableView(self.model, sort_column=score_column, descending=True, parent=self)
+        self.table.action_delegate.clicked.connect(
+            lambda index: self.updateRequested.emit(self.model.record(index.row())))
+        self.table.horizontalHeader().sectionClicked.connect(
+            lambda *_: self.table.horizontalHeader().setSortIndicatorShown(True))
 
         # Empty state
         self.empty_label = QLabel("No Results Found")
         self.empty_label.setAlignment(Qt.AlignCenter)
         self.empty_label.setStyleSheet("color:#666; font-size:14px; padding:16px;")
 
-        wrapper = QVBoxLayout(self)
-        wrapper.addLayout(top)
-        wrapper.addWidget(self.table)
-        wrapper.addWidget(self.empty_label)
-        self._set_empty(True)
+        results = QVBoxLayout()
+        results.addLayout(top)
+        results.addWidget(self.table)
+        results.addWidget(self.empty_label)
+
+        wrapper = QHBoxLayout(self)
+        wrapper.addWidget(facet_scroll)
+        wrapper.addLayout(results, 1)
 
-        self.coap_input.returnPressed.connect(self._on_find_clicked)
-        self.category_combo.activated.connect(lambda *_: self.find_btn.setFocus(Qt.OtherFocusReason))
-        self.gender_combo.activated.connect(lambda *_: self.find_btn.setFocus(Qt.OtherFocusReason))
+        # Typing restarts the debounce timer; Enter and the filters search at once
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._on_find_clicked)
+        self.search_input.textChanged.connect(lambda *_: self._debounce.start())
+        self.search_input.returnPressed.connect(self._on_find_clicked)
+        self.facet_panel.changed.connect(self._on_find_clicked)
+
+        self._on_find_clicked()
 
     # ---------- Helpers ----------
     def _set_empty(self, is_empty: bool):
-        # self.table.setVisible(not is_empty := is_empty is False)  # small flair to keep line short
-        # readability fallback
         self.table.setVisible(not is_empty)
         self.empty_label.setVisible(is_empty)
-        
-    #     def _set_empty(self, is_empty: bool):
-    #     self.table.setVisible(not is_empty)
-    #     self.empty_label.setVisible(is_empty)
-
-    def _connect(self) -> sqlite3.Connection:
-        if not self.db_path.exists():
-            raise FileNotFoundError(f"Database not found: {self.db_path}")
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        return conn
 
     # ---------- Actions ----------
+    def refresh(self):
+        """Re-run the current search / listing (e.g. after a candidate was edited)."""
+        self._on_find_clicked()
+
     def _on_find_clicked(self):
-        coap_id = self.coap_input.text().strip()
-        category = self.category_combo.currentText().strip()
-        gender = self.gender_combo.currentText().strip()
-
-        errs = []
-        if not coap_id:
-            errs.append("COAP ID")
-        if category not in {"GEN", "OBC", "SC", "ST"}:
-            errs.append("Category")
-        if gender not in {"Male", "Female"}:
-            errs.append("Gender")
-
-        if errs:
-            self._show_error_row(f"Please provide: {', '.join(errs)}")
-            return
+        self._debounce.stop()
+        text = self.search_input.text().strip()
+        filters = self.facet_panel.filters()
+        score_range = self.facet_panel.score_range()
 
         try:
-            conn = self._connect()
-            cur = conn.execute("""
-                SELECT
-                    COAP               AS coap_id,
-                    App_no             AS application_number,
-                    Category           AS category,
-                    Gender             AS gender,
-                    MaxGATEScore_3yrs  AS max_gate_score,
-                    Pwd                AS pwd,
-                    Ews                AS ews
-                FROM candidates
-                WHERE COAP = ? AND Category = ? AND Gender = ?
-                LIMIT 50;
-            """, (coap_id, category, gender))
-            rows = list(cur)
-            conn.close()
+            if not self.db_path.exists():
+                raise FileNotFoundError(f"Database not found: {self.db_path}")
+            conn = db_manager.get_connection(self.db_path)
+            counts = facets.counts(conn, filters, score_range)
+            self.facet_panel.set_counts(counts)
+            where, params = facets.candidate_where(filters, score_range)
+            if candidate_search.match_expression(text):
+                cur = conn.cursor()
+                # row_factory on the cursor, not the connection: the connection is shared
+                cur.row_factory = sqlite3.Row
+                # Ranked hits: no sort indicator until a header is clicked
+                self.table.horizontalHeader().setSortIndicatorShown(False)
+                hits = candidate_search.search(cur, text, where, params)
+                # Details of the hits are one query now instead of one per UPDATE click
+                record_cache.prefetch(conn, [hit["coap_id"] for hit in hits])
+                self.model.set_rows(hits)
+            else:
+                self.table.horizontalHeader().setSortIndicatorShown(True)
+                self.model.browse(where, params, total=counts["total"])
         except Exception as e:
-            self._show_error_row(f"DB error: {e}")
-            return
-
-        if not rows:
+            self.count_label.setText(f"DB error: {e}")
             self._set_empty(True)
             return
 
-        self._populate_table(rows)
-
-    def _show_error_row(self, message: str):
-        self.table.setRowCount(0)
-        self._set_empty(False)
-        self.table.setRowCount(1)
-        item = QTableWidgetItem(message)
-        item.setForeground(QBrush(QColor('gray')))
-        self.table.setSpan(0, 0, 1, self.table.columnCount())
-        self.table.setItem(0, 0, item)
-
-    def _populate_table(self, rows: list[sqlite3.Row]):
-        self.table.clearSpans()
-        self.table.setRowCount(0)
-        self._set_empty(False)
-
-        for row in rows:
-            r = self.table.rowCount()
-            self.table.insertRow(r)
-
-            def _set(c, v):
-                item = QTableWidgetItem("" if v is None else str(v))
-                item.setTextAlignment(Qt.AlignCenter)
-                self.table.setItem(r, c, item)
-
-            _set(0, row["coap_id"])
-            _set(1, row["application_number"])
-            _set(2, row["category"])
-            _set(3, row["gender"])
-            _set(4, row["max_gate_score"])
-            _set(5, row["pwd"])
-            _set(6, row["ews"])
-
-            # UPDATE button
-            btn = QToolButton()
-            btn.setText("UPDATE")
-            btn.setCursor(Qt.PointingHandCursor)
-            btn.clicked.connect(lambda _, rr=dict(row): self.updateRequested.emit(rr))
-            self.table.setCellWidget(r, 7, btn)
-
-        self.table.resizeColumnsToContents()
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(7, QHeaderView.ResizeToContents)
\ No newline at end of file
+        total = self.model.total_rows()
+        self.count_label.setText(f"{total} candidate{'s' if total != 1 else ''}")
+        self._set_empty(total == 0)
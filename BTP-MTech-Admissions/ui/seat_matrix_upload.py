@@ -1,9 +1,13 @@
 # ui/seat_matrix_upload.py
-import pandas as pd
+from PySide6.QtCore import Signal
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QLabel, QFileDialog, QMessageBox
-from database import db_manager
+from database.seat_ledger import SeatMatrixFormatError, load_seat_matrix_file
+from threads.job_queue import BackgroundJob, job_queue
+
 
 class SeatMatrixUpload(QWidget):
+    uploaded = Signal()
+
     def __init__(self):
         super().__init__()
         layout = QVBoxLayout(self)
@@ -23,26 +27,27 @@ class SeatMatrixUpload(QWidget):
         if not path:
             return
 
-        try:
-            df = pd.read_excel(path)
-            expected = ["category", "set_seats", "seats_allocated", "seats_booked"]
-            if not all(col in df.columns for col in expected):
-                QMessageBox.warning(self, "Invalid Format", f"Excel must contain: {', '.join(expected)}")
-                return
-            
-            df.fillna(0, inplace=True)  
-
-            conn = db_manager.get_connection()
-            cursor = conn.cursor()
-            for _, row in df.iterrows():
-                cursor.execute("""
-                    INSERT OR REPLACE INTO seat_matrix (category, set_seats, seats_allocated, seats_booked)
-                    VALUES (?, ?, ?, ?)
-                """, (row["category"], int(row["set_seats"]), int(row["seats_allocated"]), int(row["seats_booked"])))
-            conn.commit()
-            conn.close()
-
-            self.status.setText("✅ Seat matrix uploaded successfully!")
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+        self.upload_btn.setEnabled(False)
+        job = BackgroundJob("Upload seat matrix", load_seat_matrix_file, path)
+        job.progress.connect(self.status.setText)
+        job.completed.connect(self._on_uploaded)
+        job.failed.connect(self._on_failed)
+        job.cancelled.connect(self._on_cancelled)
+        job_queue().submit(job)
+
+    def _on_uploaded(self, _count):
+        self.upload_btn.setEnabled(True)
+        self.status.setText("✅ Seat matrix uploaded successfully!")
+        self.uploaded.emit()
+
+    def _on_failed(self, error):
+        self.upload_btn.setEnabled(True)
+        self.status.setText("")
+        if isinstance(self.sender().error, SeatMatrixFormatError):
+            QMessageBox.warning(self, "Invalid Format", error)
+        else:
+            QMessageBox.critical(self, "Error", error)
+
+    def _on_cancelled(self):
+        self.upload_btn.setEnabled(True)
+        self.status.setText("Upload cancelled.")
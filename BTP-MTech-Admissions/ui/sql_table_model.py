@@ -0,0 +1,184 @@
+# ui/sql_table_model.py
+from PySide6.QtCore import QAbstractTableModel, QEvent, QModelIndex, Qt, Signal
+from PySide6.QtWidgets import (
+    QAbstractItemView, QApplication, QHeaderView, QStyle, QStyledItemDelegate, QStyleOptionButton, QTableView
+)
+from database import browse, db_manager
+
+
+class SqlTableModel(QAbstractTableModel):
+    """
+    Read-only table over a database/browse.py source, fetched a page at a time.
+
+    browse() shows the whole source (optionally filtered); the view pulls the
+    next page through canFetchMore()/fetchMore() as it scrolls, and clicking
+    a sortable header re-queries with an indexed ORDER BY.  set_rows() shows
+    a fixed list instead (e.g. ranked search hits), sorted in memory.  With
+    `action` set an extra last column shows that text, for ButtonDelegate.
+    """
+    def __init__(self, db_path, source, action=None, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.source = source
+        self.action = action
+        self._keys = browse.keys(source)
+        self._headers = browse.headers(source) + ([action] if action else [])
+        self._rows = []
+        self._total = 0
+        self._fixed = False
+        self._where, self._params = "", ()
+        self._sort_column, self._descending = None, False
+
+    # ---------- Loading ----------
+    def _conn(self):
+        return db_manager.get_connection(self.db_path)
+
+    def browse(self, where="", params=(), total=None):
+        """
+        Show every row of the source matching where (SQL on the source's
+        alias).  Pass total when the number of matches is already known.
+        """
+        self.beginResetModel()
+        self._fixed = False
+        self._where, self._params = where, tuple(params)
+        if total is None:
+            total = browse.count(self._conn(), self.source, where, self._params)
+        self._total = total
+        self._rows = self._page(0)
+        self.endResetModel()
+
+    def set_rows(self, rows):
+        """Show a fixed list of rows, ordered like the source's columns."""
+        self.beginResetModel()
+        self._fixed = True
+        self._rows = [tuple(row) for row in rows]
+        self._total = len(self._rows)
+        self.endResetModel()
+
+    def _page(self, offset):
+        return browse.page(self._conn(), self.source, offset, sort_column=self._sort_column,
+                           descending=self._descending, where=self._where, params=self._params)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._fixed and len(self._rows) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        rows = self._page(len(self._rows))
+        if not rows:
+            # Rows were deleted since count(): stop asking
+            self._total = len(self._rows)
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def total_rows(self):
+        """Rows in the result, including those not fetched yet."""
+        return self._total
+
+    def record(self, row):
+        """Row as a dict keyed like the source's columns (coap_id, full_name, ...)."""
+        return dict(zip(self._keys, self._rows[row]))
+
+    # ---------- QAbstractTableModel ----------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            if index.column() >= len(self._keys):
+                return self.action
+            value = self._rows[index.row()][index.column()]
+            return "" if value is None else str(value)
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._headers[section]
+        return None
+
+    def is_sortable(self, column):
+        return 0 <= column < len(self._keys) and browse.is_sortable(self.source, column)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if not self.is_sortable(column):
+            return
+        self._sort_column, self._descending = column, order == Qt.DescendingOrder
+        if self._fixed:
+            self.layoutAboutToBeChanged.emit()
+            # None sorts first ascending, as in SQLite
+            self._rows.sort(key=lambda row: (row[column] is not None, row[column] if row[column] is not None else 0),
+                            reverse=self._descending)
+            self.layoutChanged.emit()
+        elif self._total:
+            self.browse(self._where, self._params, self._total)
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """Paints a push button with the cell's text and emits clicked(index), instead of a widget per row."""
+    clicked = Signal(QModelIndex)
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = index.data()
+        button.state = QStyle.State_Enabled | QStyle.State_Raised
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and option.rect.contains(event.position().toPoint()):
+            self.clicked.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class SqlTableView(QTableView):
+    """
+    Table view for a SqlTableModel: whole-row selection, header click sorts
+    (the indicator snaps back on columns without an index), and an optional
+    ButtonDelegate in the model's action column.
+    """
+    def __init__(self, model, sort_column=None, descending=False, parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setAlternatingRowColors(True)
+        self.verticalHeader().setVisible(False)
+        # Uniform row heights let the view skip measuring rows it never shows
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Stretch)
+        header.setHighlightSections(False)
+        self._sort = (sort_column if sort_column is not None else -1,
+                      Qt.DescendingOrder if descending else Qt.AscendingOrder)
+        header.setSortIndicator(*self._sort)
+        header.sortIndicatorChanged.connect(self._on_sort_changed)
+        self.setSortingEnabled(True)
+
+        self.action_delegate = None
+        if model.action:
+            self.action_delegate = ButtonDelegate(self)
+            self.setItemDelegateForColumn(model.columnCount() - 1, self.action_delegate)
+            header.setSectionResizeMode(model.columnCount() - 1, QHeaderView.ResizeToContents)
+
+    def _on_sort_changed(self, column, order):
+        if self.model().is_sortable(column):
+            self._sort = (column, order)
+            return
+        header = self.horizontalHeader()
+        header.blockSignals(True)
+        header.setSortIndicator(*self._sort)
+        header.blockSignals(False)
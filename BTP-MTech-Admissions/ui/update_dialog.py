@@ -2,12 +2,14 @@
 import sqlite3
 from pathlib import Path
 
-from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
-    QDialog, QWidget, QGridLayout, QVBoxLayout, QLabel, QPushButton, QScrollArea
+    QDialog, QWidget, QGridLayout, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QLineEdit, QComboBox, QMessageBox
 )
+from database import candidate_edits, candidate_history, db_manager, record_cache
+from threads.job_queue import BackgroundJob, job_queue
 
-# Map UI labels -> DB columns (None => show "NULL")
+# Map UI labels -> candidate_history columns (database/candidate_history.py)
 FIELD_MAP = {
     "FullName":               "Full_Name",
     "ApplicationNumber":      "App_no",
@@ -21,29 +23,45 @@ FIELD_MAP = {
     "SSCper":                 "SSC_per",
     "HSSCper":                "HSSC_per",
     "DegreeCGPA8thSem":       "Degree_CGPA_8th",
-    "Offered":                None,     # not in candidates -> NULL
-    "Accepted":               None,
-    "OfferCat":               None,
-    "isOfferPwd":             None,
-    "OfferedRound":           None,
-    "RetainRound":            None,
-    "RejectOrAcceptRound":    None,
+    "Offered":                "Offered",
+    "Accepted":               "Accepted",
+    "OfferCat":               "OfferCat",
+    "isOfferPwd":             "isOfferPwd",
+    "OfferedRound":           "OfferedRound",
+    "RetainRound":            "RetainRound",
+    "RejectOrAcceptRound":    "RejectOrAcceptRound",
 }
 
+EDITED_STYLE = "border:1px solid #d08000; background:#fff6e0;"
+
+
 class UpdateDialog(QDialog):
+    """
+    Candidate details.  The fields in candidate_edits.EDITABLE_COLUMNS are
+    editable: changes are staged (highlighted) until Save Changes writes them
+    in one transaction, which fails without writing anything if the candidate
+    was changed elsewhere since the dialog loaded it.  The save runs as a
+    background job, so the dialog stays responsive while an import holds the
+    database.  `saved` tells the caller whether anything was written.
+    """
     def __init__(self, db_path: str | Path, coap_id: str, parent: QWidget = None):
         super().__init__(parent)
         self.setWindowTitle(f"Candidate Details — {coap_id}")
-        self.resize(720, 520)
+        self.resize(720, 560)
         self.db_path = Path(db_path)
         self.coap_id = coap_id
+        self.saved = False
+        self._values = {}       # column -> value widget (QLabel, or an editor)
+        self._original = {}     # editable column -> text as loaded
+        self._staged = {}       # editable column -> edited text
+        self._save_job = None
 
         root = QVBoxLayout(self)
 
         # scrollable content
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
-        content = QWidget()
+        content = self._content = QWidget()
         grid = QGridLayout(content)
         grid.setHorizontalSpacing(16)
         grid.setVerticalSpacing(12)
@@ -55,58 +73,193 @@ class UpdateDialog(QDialog):
         # build cards like the screenshot (label on top, value below, boxed)
         row, col = 0, 0
         for label, colname in FIELD_MAP.items():
-            value = "NULL"
-            if colname:
-                v = data.get(colname)
-                value = "NULL" if (v is None or v == "") else str(v)
-
-            card = self._make_card(label, value)
+            card = self._make_card(label, colname)
             grid.addWidget(card, row, col)
             col += 1
             if col == 3:  # 3 cards per row feels right visually
                 col = 0
                 row += 1
 
-        # close button
+        self._show_record(data)
+
+        # round-by-round offers and decisions
+        history = self._make_timeline(data)
+
+        # buttons
+        self.status_label = QLabel("")
+        self.revert_btn = QPushButton("Revert")
+        self.revert_btn.clicked.connect(lambda: self._show_record(self._data))
+        self.save_btn = QPushButton("Save Changes")
+        self.save_btn.clicked.connect(self.save_changes)
         close_btn = QPushButton("Close")
         close_btn.clicked.connect(self.accept)
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.status_label, 1)
+        buttons.addWidget(self.revert_btn)
+        buttons.addWidget(self.save_btn)
+        buttons.addWidget(close_btn)
+        self._update_buttons()
 
         root.addWidget(scroll)
-        root.addWidget(close_btn, 0, Qt.AlignRight)
+        if history is not None:
+            root.addWidget(QLabel("Round History"))
+            root.addWidget(history)
+        root.addLayout(buttons)
+
+    # ---------- Values / staging ----------
+    @staticmethod
+    def _text(value) -> str:
+        return "" if value is None else str(value)
+
+    def _show_record(self, data: dict):
+        """Show data in every card and drop staged edits."""
+        self._data = data
+        self._staged.clear()
+        for colname, widget in self._values.items():
+            text = self._text(data.get(colname))
+            if isinstance(widget, QLabel):
+                widget.setText(text or "NULL")
+                continue
+            self._original[colname] = text
+            widget.blockSignals(True)
+            if isinstance(widget, QComboBox):
+                if widget.findText(text) < 0:
+                    widget.addItem(text)   # unexpected stored value: show it as is
+                widget.setCurrentText(text)
+            else:
+                widget.setText(text)
+            widget.setStyleSheet("")
+            widget.blockSignals(False)
+        self._update_buttons()
+
+    def _on_edited(self, colname: str, text: str):
+        if text.strip() == self._original.get(colname, ""):
+            self._staged.pop(colname, None)
+            self._values[colname].setStyleSheet("")
+        else:
+            self._staged[colname] = text
+            self._values[colname].setStyleSheet(EDITED_STYLE)
+        self._update_buttons()
+
+    def _update_buttons(self):
+        if not hasattr(self, "save_btn"):
+            return
+        idle = self._save_job is None
+        self._content.setEnabled(idle)
+        self.save_btn.setEnabled(idle and bool(self._staged))
+        self.revert_btn.setEnabled(idle and bool(self._staged))
+        if idle and self._staged:
+            self.status_label.setText(f"{len(self._staged)} unsaved change(s)")
+
+    # ---------- Saving ----------
+    def save_changes(self):
+        """Write the staged edits in one transaction (database/candidate_edits.py) on the job queue."""
+        if self._save_job is not None or not self._staged:
+            return
+        try:
+            for colname, text in self._staged.items():
+                candidate_edits.clean_value(colname, text)
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Value", str(e))
+            return
 
-    def _connect(self) -> sqlite3.Connection:
+        version = self._data.get(candidate_edits.VERSION_COLUMN, 0)
+        edits = {self._data.get("App_no"): (version, dict(self._staged))}
+        job = BackgroundJob(f"Save {self.coap_id}", candidate_edits.apply_edits, edits, db_name=self.db_path)
+        job.progress.connect(self.status_label.setText)
+        job.completed.connect(self._on_saved)
+        job.failed.connect(self._on_save_failed)
+        job.cancelled.connect(self._on_save_cancelled)
+        self._save_job = job
+        self.status_label.setText("Waiting for other database jobs...")
+        self._update_buttons()
+        job_queue().submit(job)
+
+    def _on_saved(self, _count):
+        self._save_job = None
+        self.saved = True
+        self._show_record(self._load_record())
+        self.status_label.setText("Changes saved.")
+
+    def _on_save_failed(self, message):
+        error, self._save_job = self._save_job.error, None
+        self._update_buttons()
+        if isinstance(error, candidate_edits.EditConflict):
+            QMessageBox.warning(self, "Candidate Changed", f"{message}\n\nThe current values have been reloaded.")
+            self._show_record(self._load_record())
+        elif isinstance(error, ValueError):
+            QMessageBox.warning(self, "Invalid Value", message)
+        else:
+            QMessageBox.critical(self, "Error", f"Could not save the changes:\n{message}")
+
+    def _on_save_cancelled(self):
+        self._save_job = None
+        self._update_buttons()
+        self.status_label.setText("Save cancelled — nothing was written.")
+
+    def _may_close(self) -> bool:
+        if self._save_job is not None:
+            QMessageBox.information(self, "Saving", "The changes are still being saved.")
+            return False
+        return not self._staged or QMessageBox.question(
+            self, "Discard Changes", "Discard the unsaved changes?") == QMessageBox.Yes
+
+    def accept(self):
+        if self._may_close():
+            super().accept()
+
+    def reject(self):
+        # Esc / window close
+        if self._may_close():
+            super().reject()
+
+    def _connection(self) -> sqlite3.Connection:
         if not self.db_path.exists():
             raise FileNotFoundError(f"Database not found: {self.db_path}")
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        return conn
+        return db_manager.get_connection(self.db_path)
 
     def _load_record(self) -> dict:
-        """Fetch entire row for this COAP ID."""
+        """Candidate row plus offer / decision summary for this COAP ID (cached, see record_cache)."""
         try:
-            conn = self._connect()
-            cur = conn.execute("PRAGMA table_info(candidates)")
-            cols = [r[1] for r in cur.fetchall()]
-
-            cur = conn.execute(f"""
-                SELECT {", ".join(cols)}
-                FROM candidates
-                WHERE COAP = ?
-                LIMIT 1
-            """, (self.coap_id,))
-            row = cur.fetchone()
-            conn.close()
-            return dict(row) if row else {}
+            return record_cache.record(self._connection(), self.coap_id)
         except Exception:
             return {}
 
-    def _make_card(self, label: str, value: str) -> QWidget:
+    def _make_timeline(self, data: dict):
+        """Table of the candidate's offers and decisions per round, or None if there are none."""
+        try:
+            rows = record_cache.timeline(self._connection(), self.coap_id)
+        except Exception:
+            return None
+        if not rows:
+            return None
+        table = QTableWidget(len(rows), len(candidate_history.TIMELINE_COLUMNS))
+        table.setHorizontalHeaderLabels(candidate_history.TIMELINE_COLUMNS)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        for r, row in enumerate(rows):
+            for c, v in enumerate(row):
+                table.setItem(r, c, QTableWidgetItem("" if v is None else str(v)))
+        table.setMaximumHeight(40 + 30 * len(rows))
+        return table
+
+    def _make_card(self, label: str, colname: str) -> QWidget:
         w = QWidget()
         v = QVBoxLayout(w)
         title = QLabel(label)
         title.setStyleSheet("font-weight:600; color:#333;")
-        val = QLabel(value)
-        val.setStyleSheet("color:#111; background:#fafafa; border:1px solid #ddd; padding:8px; border-radius:6px;")
+        if colname in candidate_edits.CHOICE_COLUMNS:
+            val = QComboBox()
+            val.addItems(candidate_edits.CHOICE_COLUMNS[colname])
+            val.currentTextChanged.connect(lambda text, c=colname: self._on_edited(c, text))
+        elif colname in candidate_edits.EDITABLE_COLUMNS:
+            val = QLineEdit()
+            val.textEdited.connect(lambda text, c=colname: self._on_edited(c, text))
+        else:
+            val = QLabel()
+            val.setStyleSheet("color:#111; background:#fafafa; border:1px solid #ddd; padding:8px; border-radius:6px;")
+        self._values[colname] = val
         v.addWidget(title)
         v.addWidget(val)
         return w
\ No newline at end of file
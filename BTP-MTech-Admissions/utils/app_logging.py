@@ -0,0 +1,135 @@
+# utils/app_logging.py
+"""
+Application logging.
+
+Modules log through get_logger(__name__)-style loggers under the "mtech"
+namespace.  setup_logging() (called by main.py) attaches:
+
+  * a console handler at the chosen level,
+  * a bounded in-memory ring buffer the GUI's log viewer reads from
+    (ui/log_viewer.py), which keeps every level down to DEBUG so the
+    viewer's own level filter can show them, and
+  * optionally a JSON-lines log file at the chosen level, one object per record.
+
+Set MTECH_LOG_LEVEL (DEBUG, INFO, ...) and MTECH_LOG_FILE in the environment
+to change the level or enable the JSON file without code changes.
+
+Nothing here imports Qt: the ring buffer is polled by the viewer with
+since(seq), so background threads never touch widgets.
+"""
+import json
+import logging
+import os
+import threading
+from collections import deque
+
+ROOT_LOGGER = "mtech"
+RING_BUFFER_SIZE = 5000
+CONSOLE_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+_ring = None
+_setup_lock = threading.Lock()
+
+
+def get_logger(name):
+    """Logger under the application namespace (e.g. get_logger("rounds") -> "mtech.rounds")."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last `capacity` records as (seq, levelno, text) for the GUI to display."""
+
+    def __init__(self, capacity=RING_BUFFER_SIZE):
+        super().__init__()
+        self._entries = deque(maxlen=capacity)
+        self._seq = 0
+        self._entries_lock = threading.Lock()
+        self.setFormatter(logging.Formatter(CONSOLE_FORMAT, "%H:%M:%S"))
+
+    def emit(self, record):
+        try:
+            text = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._entries_lock:
+            self._seq += 1
+            self._entries.append((self._seq, record.levelno, text))
+
+    def since(self, seq=0):
+        """Entries newer than seq, oldest first."""
+        with self._entries_lock:
+            return [entry for entry in self._entries if entry[0] > seq]
+
+    def clear(self):
+        with self._entries_lock:
+            self._entries.clear()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; extra={"fields": {...}} on a log call is merged in."""
+
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        data.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+def ring_buffer():
+    """The process-wide ring buffer handler (created on first use)."""
+    global _ring
+    with _setup_lock:
+        if _ring is None:
+            _ring = RingBufferHandler()
+            logging.getLogger(ROOT_LOGGER).addHandler(_ring)
+    return _ring
+
+
+def setup_logging(level=None, json_path=None, console=True):
+    """
+    Configure the "mtech" loggers. Safe to call more than once; later calls
+    replace the console / JSON handlers set up by earlier ones.
+
+    level applies to the console and JSON handlers; the logger itself passes
+    DEBUG records on so the ring buffer receives them.
+    """
+    level = level or os.environ.get("MTECH_LOG_LEVEL", "INFO")
+    json_path = json_path or os.environ.get("MTECH_LOG_FILE")
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(logging.DEBUG)
+    root.propagate = False
+    ring_buffer().setLevel(logging.DEBUG)
+
+    for handler in list(root.handlers):
+        if getattr(handler, "_mtech_managed", False):
+            root.removeHandler(handler)
+            handler.close()
+
+    if console:
+        stream = logging.StreamHandler()
+        stream.setLevel(level)
+        stream.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        stream._mtech_managed = True
+        root.addHandler(stream)
+
+    if json_path:
+        file_handler = logging.FileHandler(json_path, encoding="utf-8")
+        file_handler.setLevel(level)
+        file_handler.setFormatter(JsonFormatter())
+        file_handler._mtech_managed = True
+        root.addHandler(file_handler)
+
+    return root